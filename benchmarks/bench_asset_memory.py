@@ -0,0 +1,89 @@
+"""Resident bytes per cached asset: legacy dicts vs slotted AssetRecords.
+
+Rows are read from a real catalog so both variants hold the same freshly decoded strings,
+and everything still alive after the rows are dropped is counted.
+
+    python benchmarks/bench_asset_memory.py --size 200000
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.assets import AssetRecord
+from src.cache import TTLCache
+from src.catalog import AssetCatalog, COLUMNS, encode_price
+
+
+def legacy_dict(row):
+    # The asset shape stored in listed_assets before AssetRecord
+    asset_id, owner, name, description, price, is_stream, ipfs_hash, stream_id = row
+    asset = {
+        "owner": owner,
+        "name": name,
+        "description": description,
+        "price": int(price),
+        "is_stream": bool(is_stream),
+    }
+    if ipfs_hash is not None:
+        asset["ipfs_hash"] = ipfs_hash
+    if stream_id is not None:
+        asset["stream_id"] = stream_id
+    return asset_id, asset
+
+
+def record(row):
+    asset = AssetRecord.from_row(row)
+    return asset.asset_id, asset
+
+
+def build(size: int, path: str) -> AssetCatalog:
+    catalog = AssetCatalog(path)
+    rows = [
+        (asset_id, f"0x{asset_id % 5000:040x}", f"Asset {asset_id}", "Hourly sensor readings",
+         encode_price(10**18 + asset_id), asset_id % 2, None if asset_id % 2 else f"Qm{asset_id:044d}",
+         f"stream-{asset_id}" if asset_id % 2 else None)
+        for asset_id in range(size)
+    ]
+    with catalog.db.transaction() as conn:
+        conn.executemany(f"INSERT INTO assets ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return catalog
+
+
+def measure(catalog: AssetCatalog, convert, size: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    rows = catalog.db.connection().execute(f"SELECT {COLUMNS} FROM assets").fetchall()
+    cache = TTLCache(maxsize=size, ttl=float('inf'))
+    for row in rows:
+        asset_id, asset = convert(row)
+        cache.set(asset_id, asset)
+    del rows, row
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(cache) == size
+    return current / size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = build(args.size, os.path.join(tmp, "catalog.db"))
+        before = measure(catalog, legacy_dict, args.size)
+        after = measure(catalog, record, args.size)
+        catalog.db.close()
+
+    print(f"{'assets':>10} {'dict (B/asset)':>16} {'record (B/asset)':>18} {'saved':>8}")
+    print(f"{args.size:>10} {before:>16.0f} {after:>18.0f} {1 - after / before:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Cold-start profile: `python -X importtime` for a module, summarised, against a budget.
+
+Each round imports the module in a fresh interpreter (key store and catalog pointed at
+a temp dir) and reads the interpreter's own import timings. The report gives the median
+import time, the slowest top-level imports by cumulative time and the heaviest modules
+by self time. With --budget-ms the exit status is 1 when the median is over budget.
+
+    python benchmarks/bench_importtime.py main --rounds 5 --budget-ms 2000
+    python benchmarks/bench_importtime.py src.did_manager --top 15 --json importtime.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import times of the service's entry points on a reference machine are roughly
+# main 1.3 s, src.did_manager 0.45 s, config 10 ms; budgets leave room for slower CI
+BUDGETS_MS = {"main": 2000, "src.did_manager": 800, "config": 100}
+
+
+def profile(module: str) -> List[Tuple[int, int, int, str]]:
+    # (self us, cumulative us, depth, name) for every module imported by `import module`
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, KEY_STORE_PATH=os.path.join(tmp, "keys.db"), KEY_FILE=os.path.join(tmp, "keys.json"),
+                   CATALOG_DB_PATH=os.path.join(tmp, "catalog.db"))
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def import_ms(rows: List[Tuple[int, int, int, str]], module: str) -> float:
+    for _, cumulative_us, depth, name in rows:
+        if name == module and depth == 0:
+            return cumulative_us / 1000
+    raise ValueError(f"{module} not found in the import profile")
+
+
+def summarize(rows: List[Tuple[int, int, int, str]], module: str, top: int) -> Dict:
+    direct = sorted((row for row in rows if row[2] == 1), key=lambda row: -row[1])
+    heaviest = sorted(rows, key=lambda row: -row[0])
+    return {
+        "import_ms": import_ms(rows, module),
+        "modules": len(rows),
+        "top_cumulative": [{"module": name, "ms": cumulative / 1000} for _, cumulative, _, name in direct[:top]],
+        "top_self": [{"module": name, "ms": self_us / 1000} for self_us, _, _, name in heaviest[:top]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="main")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, help=f"Defaults: {BUDGETS_MS}")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    runs = [profile(args.module) for _ in range(args.rounds)]
+    timings = [import_ms(rows, args.module) for rows in runs]
+    median = statistics.median(timings)
+    # Module breakdown from the round closest to the median
+    report = summarize(min(runs, key=lambda rows: abs(import_ms(rows, args.module) - median)), args.module, args.top)
+    report.update(module=args.module, median_ms=median, min_ms=min(timings), max_ms=max(timings),
+                  budget_ms=args.budget_ms or BUDGETS_MS.get(args.module))
+
+    print(f"import {args.module}: median {median:.0f} ms, min {min(timings):.0f}, max {max(timings):.0f} "
+          f"({args.rounds} rounds, {report['modules']} modules)")
+    print("\nslowest direct imports (cumulative):")
+    for row in report["top_cumulative"]:
+        print(f"  {row['ms']:>8.1f} ms  {row['module']}")
+    print("\nheaviest modules (self):")
+    for row in report["top_self"]:
+        print(f"  {row['ms']:>8.1f} ms  {row['module']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if report["budget_ms"] is not None:
+        verdict = "within" if median <= report["budget_ms"] else "OVER"
+        print(f"\n{verdict} budget of {report['budget_ms']:.0f} ms")
+        if median > report["budget_ms"]:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
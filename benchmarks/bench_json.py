@@ -0,0 +1,104 @@
+"""Response encode throughput: FastAPI's default JSONResponse vs FastJSONResponse.
+
+Payloads are a catalog page built from AssetRecords and a batch of transaction receipts.
+"default" is what FastAPI did before (jsonable_encoder + stdlib json). For receipts it is
+fed pre-hexed dicts, since HexBytes does not survive jsonable_encoder; the fast path
+encodes them as FastJSONRoute does, with no jsonable_encoder pass.
+
+    python benchmarks/bench_json.py --page-size 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+
+from src import responses
+from src.assets import AssetRecord
+from src.responses import FastJSONResponse
+
+
+def catalog_page(size: int):
+    assets = [
+        AssetRecord(asset_id, f"0x{asset_id % 50:040x}", f"Air quality sensor {asset_id}",
+                    "Hourly PM2.5, PM10 and NO2 readings from a city-centre roadside station",
+                    10**18 * (asset_id % 7 + 1), asset_id % 2 == 0, f"Qm{asset_id:044d}")
+        for asset_id in range(size)
+    ]
+    return {"success": True, "assets": [asset.to_listing() for asset in assets], "next_cursor": "eyJzIjoiaWRfYXNjIiwiaSI6NTAwfQ"}
+
+
+def receipts(count: int):
+    return [
+        AttributeDict({
+            "transactionHash": HexBytes(os.urandom(32)),
+            "blockHash": HexBytes(os.urandom(32)),
+            "blockNumber": 1000 + i,
+            "from": f"0x{i:040x}",
+            "to": f"0x{i + 1:040x}",
+            "gasUsed": 51234,
+            "effectiveGasPrice": 2 * 10**9,
+            "status": 1,
+            "logs": [AttributeDict({
+                "address": f"0x{i:040x}",
+                "data": HexBytes(os.urandom(64)),
+                "topics": [HexBytes(os.urandom(32)) for _ in range(3)],
+                "logIndex": 0,
+            })],
+        })
+        for i in range(count)
+    ]
+
+
+def hexed(value):
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, (dict, AttributeDict)):
+        return {key: hexed(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [hexed(item) for item in value]
+    return value
+
+
+def throughput(render, payload, seconds: float):
+    size = len(render(payload))
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        render(payload)
+        count += 1
+    elapsed = time.perf_counter() - start
+    return count / elapsed, size * count / elapsed / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--receipts", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    page = catalog_page(args.page_size)
+    batch = {"success": True, "receipts": receipts(args.receipts)}
+    cases = [
+        ("catalog page", "default", lambda p: JSONResponse(jsonable_encoder(p)).body, page),
+        ("catalog page", "fast", lambda p: FastJSONResponse(jsonable_encoder(p)).body, page),
+        ("catalog page", "fast, cached path", responses.dumps, page),
+        ("receipts", "default", lambda p: JSONResponse(jsonable_encoder(hexed(p))).body, batch),
+        ("receipts", "fast", lambda p: FastJSONResponse(p).body, batch),
+        ("receipts", "fast, direct", responses.dumps, batch),
+    ]
+    print(f"encoder: {'orjson' if responses.orjson is not None else 'stdlib fallback'}")
+    print(f"{'payload':>14} {'path':>18} {'responses/s':>12} {'MB/s':>8}")
+    for name, path, render, payload in cases:
+        rate, mbps = throughput(render, payload, args.seconds)
+        print(f"{name:>14} {path:>18} {rate:>12.0f} {mbps:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
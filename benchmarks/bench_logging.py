@@ -0,0 +1,83 @@
+"""Caller-side cost of a log call: logging.basicConfig's StreamHandler vs the queue pipeline.
+
+Only the time spent in the calling thread (the event loop, in the service) is measured.
+--write-latency-ms simulates a slow log sink (a full stdout pipe, a stalled log driver):
+
+    python benchmarks/bench_logging.py --records 50000 --output /tmp/bench.log
+    python benchmarks/bench_logging.py --records 2000 --write-latency-ms 0.5
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Unbounded, so every record is written rather than dropped
+os.environ.setdefault("LOG_QUEUE_SIZE", "0")
+
+from src import logging_setup
+
+RECEIPT = {
+    "transactionHash": "0x" + "ab" * 32, "blockNumber": 1234, "gasUsed": 51234, "status": 1,
+    "logs": [{"address": "0x" + "11" * 20, "topics": ["0x" + "cd" * 32] * 3, "data": "0x" + "00" * 64}],
+}
+
+
+class SlowStream:
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str) -> int:
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def per_call_us(logger: logging.Logger, records: int, receipt: bool) -> float:
+    start = time.perf_counter()
+    for i in range(records):
+        if receipt:
+            logger.info("Transaction receipt: %s", RECEIPT)
+        else:
+            logger.info("Purchased asset: %s by wallet: %s", i, "0x" + "22" * 20)
+    return (time.perf_counter() - start) / records * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--output", default=os.devnull)
+    parser.add_argument("--write-latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    results = []
+    for receipt in (False, True):
+        label = "receipt" if receipt else "short"
+        with open(args.output, "a") as output:
+            stream = SlowStream(output, args.write_latency_ms / 1000) if args.write_latency_ms else output
+            handler = logging.StreamHandler(stream)
+            handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+            logger.handlers = [handler]
+            results.append((label, "basicConfig-style", per_call_us(logger, args.records, receipt)))
+
+            handler = logging.StreamHandler(stream)
+            handler.setFormatter(logging_setup.JSONFormatter())
+            queue_handler = logging_setup.setup_logging(handler)
+            logger.handlers = [queue_handler]
+            results.append((label, "queue + JSON", per_call_us(logger, args.records, receipt)))
+            logging_setup.shutdown_logging()
+
+    print(f"{'message':>8} {'pipeline':>18} {'us/call':>8}")
+    for label, pipeline, us in results:
+        print(f"{label:>8} {pipeline:>18} {us:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-user listing latency as the catalog grows.
+
+Compares the legacy full scan over a listed_assets dict with AssetCatalog.list_by_owner,
+for an owner holding a fixed number of assets.
+
+    python benchmarks/bench_owner_index.py --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.catalog import AssetCatalog, COLUMNS, encode_price
+
+OWNED = 10
+OWNER = "0x" + "ab" * 20
+
+
+def owner_of(asset_id: int) -> str:
+    # The first OWNED assets belong to OWNER, the rest are spread over many other wallets
+    return OWNER if asset_id < OWNED else f"0x{asset_id % 50000:040x}"
+
+
+def build(size: int, path: str):
+    listed_assets = {}
+    catalog = AssetCatalog(path)
+    rows = []
+    for asset_id in range(size):
+        asset = {
+            "owner": owner_of(asset_id),
+            "name": f"Asset {asset_id}",
+            "description": "Benchmark asset",
+            "price": 100 + asset_id,
+            "is_stream": asset_id % 2 == 0,
+            "ipfs_hash": f"Qm{asset_id}",
+        }
+        listed_assets[asset_id] = asset
+        rows.append((asset_id, asset["owner"], asset["name"], asset["description"], encode_price(asset["price"]),
+                     int(asset["is_stream"]), asset["ipfs_hash"], None))
+    with catalog.db.transaction() as conn:
+        conn.executemany(f"INSERT INTO assets ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return listed_assets, catalog
+
+
+def measure(func, repeat: int) -> float:
+    func()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def legacy_scan(listed_assets):
+    return [
+        {"asset_id": asset_id, **asset_data}
+        for asset_id, asset_data in listed_assets.items()
+        if asset_data["owner"] == OWNER
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'assets':>10} {'dict scan (us)':>16} {'owner index (us)':>18}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            listed_assets, catalog = build(size, os.path.join(tmp, "catalog.db"))
+            assert len(catalog.list_by_owner(OWNER)) == OWNED
+            scan_us = measure(lambda: legacy_scan(listed_assets), max(1, args.repeat // 10))
+            index_us = measure(lambda: [d.to_dict() for _, d in catalog.list_by_owner(OWNER)], args.repeat)
+            print(f"{size:>10} {scan_us:>16.1f} {index_us:>18.1f}")
+            catalog.db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Full-text search latency over a large catalog.
+
+    python benchmarks/bench_search.py --size 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.catalog import AssetCatalog, COLUMNS, encode_price
+
+WORDS = (
+    "weather traffic energy sensor market stock air quality satellite imagery shipping port "
+    "retail footfall temperature humidity rainfall solar wind grid load price index crypto "
+    "mobility parking noise water river flood soil crop yield health clinic hospital"
+).split()
+
+
+def build(size: int, path: str) -> AssetCatalog:
+    rng = random.Random(42)
+    catalog = AssetCatalog(path)
+    batch = []
+    with catalog.db.transaction() as conn:
+        for asset_id in range(size):
+            name = " ".join(rng.sample(WORDS, 3)) + f" {asset_id}"
+            description = " ".join(rng.choices(WORDS, k=12))
+            batch.append((asset_id, f"0x{asset_id % 50000:040x}", name, description, encode_price(100),
+                          0, f"Qm{asset_id}", None))
+            if len(batch) == 10000:
+                conn.executemany(f"INSERT INTO assets ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                batch = []
+        if batch:
+            conn.executemany(f"INSERT INTO assets ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    queries = ["weather", "solar grid", "flood river soil", "hosp", "satellite imagery port", "123456"]
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        catalog = build(args.size, os.path.join(tmp, "catalog.db"))
+        print(f"Indexed {args.size} assets in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'query':>24} {'hits/page':>10} {'median (ms)':>12} {'page 5 (ms)':>12}")
+        for query in queries:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                hits, cursor, _ = catalog.search(query, args.limit)
+                timings.append(time.perf_counter() - start)
+            page = cursor
+            for _ in range(4):
+                if page is None:
+                    break
+                _, page, _ = catalog.search(query, args.limit, cursor=page)
+            start = time.perf_counter()
+            if page is not None:
+                catalog.search(query, args.limit, cursor=page)
+            page_5 = (time.perf_counter() - start) * 1000
+            print(f"{query:>24} {len(hits):>10} {statistics.median(timings) * 1000:>12.2f} {page_5:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Shared fixtures for the pytest-benchmark suites in this directory.
+
+The key store, legacy key file and Fernet key are pointed at a throwaway directory before
+anything from src is imported, so running the suite never touches keys.db in the checkout.
+
+`bench` wraps pytest-benchmark's `benchmark` fixture and also records the memory allocated
+by one call (tracemalloc peak above the starting point, and bytes still held afterwards) in
+the saved JSON under extra_info. With --alloc-baseline pointing at an earlier saved run,
+tests whose allocation grew by more than --alloc-fail percent fail.
+"""
+import base64
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix="core-bench-")
+os.environ.setdefault("KEY_STORE_PATH", os.path.join(_tmp, "keys.db"))
+os.environ.setdefault("KEY_FILE", os.path.join(_tmp, "keys.json"))
+# A fixed Fernet key skips the 100k-round PBKDF2 derivation at first use
+os.environ.setdefault("DERIVED_KEY", base64.urlsafe_b64encode(b"core-benchmarks-fernet-key-32byt").decode())
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Calls per allocation measurement; the first one is a warm-up and is not counted
+ALLOC_CALLS = 5
+# Absolute slack so tiny allocations do not fail on a few bytes of noise
+ALLOC_SLACK_BYTES = 512
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("core allocations")
+    group.addoption("--alloc-baseline", default=None,
+                    help="pytest-benchmark JSON from an earlier run to compare allocations against")
+    group.addoption("--alloc-fail", type=float, default=20.0,
+                    help="Fail when peak bytes per call grew by more than this percent (default 20)")
+
+
+def _load_baseline(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {bench["fullname"]: bench.get("extra_info", {}) for bench in data.get("benchmarks", [])}
+
+
+@pytest.fixture(scope="session")
+def alloc_baseline(pytestconfig):
+    path = pytestconfig.getoption("--alloc-baseline")
+    return _load_baseline(path) if path else {}
+
+
+def measure_allocations(func, *args, **kwargs):
+    func(*args, **kwargs)
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOC_CALLS - 1):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            func(*args, **kwargs)
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(after - before)
+    finally:
+        tracemalloc.stop()
+    return min(peaks), min(retained)
+
+
+@pytest.fixture
+def bench(benchmark, request, alloc_baseline, pytestconfig):
+    def run(func, *args, **kwargs):
+        peak, retained = measure_allocations(func, *args, **kwargs)
+        benchmark.extra_info["alloc_peak_bytes"] = peak
+        benchmark.extra_info["alloc_retained_bytes"] = retained
+        result = benchmark(func, *args, **kwargs)
+
+        baseline = alloc_baseline.get(request.node.nodeid, {}).get("alloc_peak_bytes")
+        if baseline is not None:
+            limit = baseline * (1 + pytestconfig.getoption("--alloc-fail") / 100) + ALLOC_SLACK_BYTES
+            if peak > limit:
+                pytest.fail(f"Peak allocation per call regressed: {peak} B, baseline {baseline} B, limit {limit:.0f} B")
+        return result
+
+    return run
@@ -0,0 +1,271 @@
+"""Load generator: many concurrent simulated wallets running the client_demo journeys.
+
+Each wallet loops over journeys picked by weight until the run ends:
+
+    browse   connect -> authenticate -> list
+    consume  connect -> authenticate -> list -> purchase -> download (static) / access stream -> subscribe (stream)
+    produce  connect -> authenticate -> add static asset -> producer list
+
+and the report gives throughput and p50/p95/p99 latency per step. Runs fully offline
+against ganache and the mock_services.py stand-ins, e.g.:
+
+    ganache --wallet.totalAccounts 50 --wallet.accountKeysPath keys.json &
+    uvicorn mock_services:app --port 8001 &
+    uvicorn main:app --port 8000 --workers 4 &
+    python benchmarks/loadtest.py --wallets 2000 --ramp-up 30 --duration 120 \\
+        --mix browse=6,consume=3,produce=1 --keys-file keys.json
+
+Without --keys-file every wallet gets a fresh random key: connect, authenticate and list
+work, but on-chain steps fail unless the wallet is funded, and are reported as errors.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+import client_demo
+
+STEPS = ["connect", "authenticate", "list", "purchase", "download", "access_stream", "subscribe", "add_asset",
+         "producer_list"]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, step: str, seconds: float, status) -> None:
+        self.latencies[step].append(seconds)
+        self.statuses[step][str(status)] += 1
+        if status == "error" or (isinstance(status, int) and status >= 400):
+            self.errors[step] += 1
+
+    def report(self, elapsed: float) -> List[Dict]:
+        rows = []
+        for step in STEPS + sorted(set(self.latencies) - set(STEPS)):
+            timings = sorted(self.latencies.get(step, []))
+            if not timings:
+                continue
+            rows.append({
+                "step": step,
+                "count": len(timings),
+                "errors": self.errors[step],
+                "rps": len(timings) / elapsed,
+                "p50_ms": percentile(timings, 50) * 1000,
+                "p95_ms": percentile(timings, 95) * 1000,
+                "p99_ms": percentile(timings, 99) * 1000,
+                "max_ms": timings[-1] * 1000,
+                "statuses": dict(self.statuses[step]),
+            })
+        return rows
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def request(stats: Stats, step: str, session, method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    try:
+        async with session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            stats.record(step, time.perf_counter() - start, response.status)
+            return response.status, body
+    except Exception:
+        stats.record(step, time.perf_counter() - start, "error")
+        return None, None
+
+
+class Wallet:
+    def __init__(self, private_key: str):
+        self.account = Account.from_key(private_key)
+        self.headers: Optional[Dict[str, str]] = None
+
+
+async def authenticate(wallet: Wallet, session, stats: Stats, base_url: str) -> bool:
+    # Same requests as client_demo.connect_and_authenticate, timed with their HTTP status
+    address = wallet.account.address
+    status, body = await request(stats, "connect", session, "POST", f"{base_url}/connect-wallet", json={"address": address})
+    if status != 200:
+        return False
+    message = encode_defunct(text=f"Authenticate to Data Marketplace with nonce: {json.loads(body)['nonce']}")
+    signature = Account.sign_message(message, wallet.account.key).signature.hex()
+    status, body = await request(stats, "authenticate", session, "POST", f"{base_url}/authenticate-wallet",
+                                 json={"address": address, "signature": signature})
+    if status != 200:
+        return False
+    session_token = json.loads(body).get("session_token")
+    wallet.headers = {"Authorization": f"Bearer {session_token}"} if session_token else {"wallet-address": address}
+    return True
+
+
+async def list_assets(wallet: Wallet, session, stats: Stats, base_url: str, rng: random.Random) -> List[Dict]:
+    status, body = await request(
+        stats, "list", session, "GET", f"{base_url}/consumer/list-assets",
+        params={"limit": "50", "sort": rng.choice(["id_desc", "price_asc"])}, headers=wallet.headers
+    )
+    if status != 200:
+        return []
+    return json.loads(body).get("assets", [])
+
+
+async def browse(wallet: Wallet, session, stats: Stats, args, rng: random.Random) -> None:
+    await list_assets(wallet, session, stats, args.base_url, rng)
+
+
+async def consume(wallet: Wallet, session, stats: Stats, args, rng: random.Random) -> None:
+    assets = [asset for asset in await list_assets(wallet, session, stats, args.base_url, rng)
+              if asset["owner"].lower() != wallet.account.address.lower()]
+    if not assets:
+        return
+    asset = rng.choice(assets)
+    await think(args, rng)
+    status, _ = await request(
+        stats, "purchase", session, "POST", f"{args.base_url}/consumer/purchase-asset/{asset['id']}",
+        json={"message": f"Purchase asset {asset['id']}"}, headers=wallet.headers
+    )
+    if status != 200:
+        return
+    await think(args, rng)
+    if asset["is_stream"]:
+        status, body = await request(stats, "access_stream", session, "GET",
+                                     f"{args.base_url}/consumer/access-stream/{asset['id']}", headers=wallet.headers)
+        if status != 200:
+            return
+        await request(stats, "subscribe", session, "POST", f"{args.base_url}/consumer/subscribe-stream",
+                      json={"stream_id": json.loads(body)["stream_id"]}, headers=wallet.headers)
+    else:
+        await request(stats, "download", session, "GET", f"{args.base_url}/consumer/asset-content/{asset['id']}",
+                      headers=wallet.headers)
+
+
+async def produce(wallet: Wallet, session, stats: Stats, args, rng: random.Random) -> None:
+    form = aiohttp.FormData()
+    form.add_field("file", os.urandom(args.upload_bytes), filename="load_test_asset.bin")
+    form.add_field("name", f"Load test asset {rng.randrange(10**9)}")
+    form.add_field("description", "Synthetic asset listed by the load generator")
+    form.add_field("price", str(rng.randint(1, 1000)))
+    await request(stats, "add_asset", session, "POST", f"{args.base_url}/producer/add-static-asset",
+                  data=form, headers=wallet.headers)
+    await think(args, rng)
+    await request(stats, "producer_list", session, "GET", f"{args.base_url}/producer/list-assets",
+                  headers=wallet.headers)
+
+
+JOURNEYS = {"browse": browse, "consume": consume, "produce": produce}
+
+
+async def think(args, rng: random.Random) -> None:
+    if args.think_ms:
+        await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+
+
+async def run_wallet(wallet: Wallet, session, stats: Stats, args, mix, start_delay: float, deadline: float, seed: int):
+    rng = random.Random(seed)
+    await asyncio.sleep(start_delay)
+    names, weights = zip(*mix.items())
+    while time.perf_counter() < deadline:
+        if wallet.headers is None or not args.reuse_session:
+            if not await authenticate(wallet, session, stats, args.base_url):
+                await asyncio.sleep(1)
+                continue
+            await think(args, rng)
+        journey = rng.choices(names, weights)[0]
+        await JOURNEYS[journey](wallet, session, stats, args, rng)
+        await think(args, rng)
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in JOURNEYS:
+            raise argparse.ArgumentTypeError(f"Unknown journey {name!r}, expected one of {sorted(JOURNEYS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_keys(path: Optional[str], count: int) -> List[str]:
+    if not path:
+        return [Account.create().key.hex() for _ in range(count)]
+    with open(path) as f:
+        data = json.load(f)
+    # A plain list of keys, or ganache's --wallet.accountKeysPath output
+    keys = list(data.get("private_keys", {}).values()) if isinstance(data, dict) else list(data)
+    return [keys[i % len(keys)] for i in range(count)]
+
+
+async def run(args) -> Dict:
+    mix = args.mix
+    keys = load_keys(args.keys_file, args.wallets)
+    wallets = [Wallet(key) for key in keys]
+    stats = Stats()
+    connector = aiohttp.TCPConnector(limit=args.connections)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    deadline = start + args.ramp_up + args.duration
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(
+            run_wallet(wallet, session, stats, args, mix, args.ramp_up * i / len(wallets), deadline, args.seed + i)
+            for i, wallet in enumerate(wallets)
+        ))
+    elapsed = time.perf_counter() - start
+    return {
+        "wallets": args.wallets,
+        "elapsed_s": elapsed,
+        # Close to 100% means the generator itself is the bottleneck; run several in parallel
+        "client_cpu_pct": (time.process_time() - cpu_start) / elapsed * 100,
+        "steps": stats.report(elapsed),
+    }
+
+
+def print_report(result: Dict) -> None:
+    print(f"{result['wallets']} wallets, {result['elapsed_s']:.1f}s, generator CPU {result['client_cpu_pct']:.0f}%")
+    print(f"{'step':>14} {'count':>8} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for row in result["steps"]:
+        print(f"{row['step']:>14} {row['count']:>8} {row['errors']:>7} {row['rps']:>8.1f} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=client_demo.BASE_URL)
+    parser.add_argument("--wallets", type=int, default=1000, help="Concurrent simulated wallets")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Seconds over which wallets are started")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run at full load after ramp-up")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("browse=6,consume=3,produce=1"),
+                        help="Journey weights, e.g. browse=6,consume=3,produce=1")
+    parser.add_argument("--think-ms", type=float, default=500, help="Mean think time between steps (0 for none)")
+    parser.add_argument("--reuse-session", action="store_true", help="Authenticate once per wallet, not per journey")
+    parser.add_argument("--keys-file", help="JSON list of private keys, or a ganache accountKeysPath file")
+    parser.add_argument("--upload-bytes", type=int, default=1024)
+    parser.add_argument("--connections", type=int, default=1000, help="Max open connections to the service")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
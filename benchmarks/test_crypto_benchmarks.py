@@ -0,0 +1,117 @@
+"""Microbenchmarks for the crypto and key hot paths: proof generation and verification,
+key store reads and writes, DID creation and wallet signature recovery.
+
+Record a baseline, then compare later runs against it; a median slowdown beyond the
+threshold, or peak allocation per call growing past --alloc-fail percent, fails the run:
+
+    python -m pytest benchmarks/test_crypto_benchmarks.py --benchmark-autosave
+    python -m pytest benchmarks/test_crypto_benchmarks.py \\
+        --benchmark-compare --benchmark-compare-fail=median:15% \\
+        --alloc-baseline .benchmarks/<machine>/0001_<commit>.json --alloc-fail 20
+
+Inputs are fixed keys and messages, so numbers are comparable between runs.
+"""
+import base64
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from cryptography.hazmat.primitives import serialization
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from src import did_manager, wallet_auth
+from src.did_manager import ZKProof
+from src.key_management import KeyManager
+from src.key_store import SQLiteKeyStore
+
+MESSAGE = "Subscription proof for 0x00000000000000000000000000000000000000aa on stream 42"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+# Only "d" is read when deriving the signing key, but keep the JWK shape didkit produces
+PRIVATE_KEY = json.dumps({"kty": "OKP", "crv": "Ed25519", "x": _b64(bytes(range(32, 64))), "d": _b64(bytes(range(32)))})
+DID = "did:key:z6MkBenchmarkFixture"
+WALLET = Account.from_key("0x" + "4c" * 32)
+
+
+@pytest.fixture(scope="module")
+def zkp():
+    return ZKProof()
+
+
+@pytest.fixture(scope="module")
+def signing_key(zkp):
+    return zkp.load_signing_key(PRIVATE_KEY)
+
+
+@pytest.fixture(scope="module")
+def public_key(signing_key):
+    return signing_key.public_key().public_bytes(serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint)
+
+
+@pytest.fixture
+def key_manager(tmp_path):
+    manager = KeyManager("unused", derived_key=os.environ["DERIVED_KEY"], store=SQLiteKeyStore(str(tmp_path / "keys.db")))
+    manager.add_key(DID, PRIVATE_KEY)
+    return manager
+
+
+def _signed_auth(nonce: int):
+    message = wallet_auth.auth_message(f"{nonce:032x}")
+    signature = Account.sign_message(encode_defunct(text=message), WALLET.key).signature.to_0x_hex()
+    return WALLET.address, message, signature
+
+
+def test_generate_proof(bench, zkp):
+    # Key derivation from the stored JWK plus signing: the signing key cache miss path
+    bench(zkp.generate_proof, PRIVATE_KEY, MESSAGE)
+
+
+def test_sign_with_cached_key(bench, zkp, signing_key):
+    bench(zkp.sign, signing_key, MESSAGE)
+
+
+def test_verify_proof(bench, zkp, signing_key, public_key):
+    proof = zkp.sign(signing_key, MESSAGE)
+    assert bench(ZKProof.verify, proof, public_key)
+
+
+def test_key_manager_get_key_cached(bench, key_manager):
+    assert bench(key_manager.get_key, DID) == PRIVATE_KEY
+
+
+def test_key_manager_get_key_from_store(bench, key_manager):
+    # What another worker pays the first time it sees a DID
+    def get_uncached():
+        key_manager.keys.clear()
+        return key_manager.get_key(DID)
+
+    assert bench(get_uncached) == PRIVATE_KEY
+
+
+def test_key_manager_add_key(bench, key_manager):
+    bench(key_manager.add_key, DID, PRIVATE_KEY)
+
+
+def test_create_did(bench):
+    did, _ = bench(did_manager._create_did)
+    assert did.startswith("did:key:")
+
+
+def test_recover_auth_signature(bench):
+    item = _signed_auth(1)
+    assert bench(wallet_auth._verify_batch, [item]) == [True]
+
+
+def test_recover_auth_signature_batch(bench, benchmark):
+    # One executor hop's worth of sign-ins, as batched by WalletAuthVerifier
+    items = [_signed_auth(nonce) for nonce in range(64)]
+    benchmark.extra_info["items"] = len(items)
+    assert all(bench(wallet_auth._verify_batch, items))
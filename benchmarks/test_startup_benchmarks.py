@@ -0,0 +1,26 @@
+"""Cold-start import time of the service's entry points, tracked with pytest-benchmark.
+
+Each round imports the module in a fresh interpreter; the test fails when the median
+import time is over its budget in bench_importtime.BUDGETS_MS. Compare against a saved
+run the same way as the crypto suite:
+
+    python -m pytest benchmarks/test_startup_benchmarks.py --benchmark-autosave
+    python -m pytest benchmarks/test_startup_benchmarks.py --benchmark-compare --benchmark-compare-fail=median:20%
+"""
+import statistics
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from bench_importtime import BUDGETS_MS, import_ms, profile, summarize
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS_MS))
+def test_cold_import(benchmark, module):
+    runs = []
+    benchmark.pedantic(lambda: runs.append(profile(module)), rounds=5, iterations=1)
+    median = statistics.median(import_ms(rows, module) for rows in runs)
+    benchmark.extra_info["import_ms"] = median
+    benchmark.extra_info["top_cumulative"] = summarize(runs[-1], module, 5)["top_cumulative"]
+    assert median <= BUDGETS_MS[module], f"import {module} took {median:.0f} ms, budget {BUDGETS_MS[module]} ms"
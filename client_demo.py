@@ -12,19 +12,20 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def connect_and_authenticate(session, wallet_address, private_key):
-    # Connect wallet
-    connect_response = await session.post("http://localhost:8000/connect-wallet", json={"address": wallet_address})
+BASE_URL = os.getenv("CORE_URL", "http://localhost:8000")
+
+async def connect_wallet(session, wallet_address, base_url=BASE_URL):
+    connect_response = await session.post(f"{base_url}/connect-wallet", json={"address": wallet_address})
     connect_data = await connect_response.json()
     logger.info("Wallet connected: %s", connect_data)
-    nonce = connect_data["nonce"]
+    return connect_data.get("nonce")
 
-    # Authenticate wallet
+async def authenticate_wallet(session, wallet_address, private_key, nonce, base_url=BASE_URL):
     message = f"Authenticate to Data Marketplace with nonce: {nonce}"
     message_hash = encode_defunct(text=message)
-    signed_message = Web3().eth.account.sign_message(message_hash, private_key)
+    signed_message = Account.sign_message(message_hash, private_key)
 
-    auth_response = await session.post("http://localhost:8000/authenticate-wallet", json={
+    auth_response = await session.post(f"{base_url}/authenticate-wallet", json={
         "address": wallet_address,
         "signature": signed_message.signature.hex()
     })
@@ -36,11 +37,21 @@ async def connect_and_authenticate(session, wallet_address, private_key):
         logger.error("Failed to authenticate wallet: %s", error_data)
         return 
 
-    # Use the authenticated wallet address for subsequent requests
-    headers = {"wallet-address": wallet_address}
+    # Use the session token for subsequent requests, falling back to the wallet address header
+    if auth_data.get("session_token"):
+        headers = {"Authorization": f"Bearer {auth_data['session_token']}"}
+    else:
+        headers = {"wallet-address": wallet_address}
     return headers
 
-async def data_producer_journey(session, headers):
+async def connect_and_authenticate(session, wallet_address, private_key, base_url=BASE_URL):
+    nonce = await connect_wallet(session, wallet_address, base_url)
+    if nonce is None:
+        logger.error("Failed to connect wallet %s", wallet_address)
+        return
+    return await authenticate_wallet(session, wallet_address, private_key, nonce, base_url)
+
+async def data_producer_journey(session, headers, base_url=BASE_URL):
     logger.info("--- Data Producer Journey ---")
 
     # Create a static asset
@@ -55,7 +66,7 @@ async def data_producer_journey(session, headers):
     form_data.add_field('description', 'A test static asset created by a producer')
     form_data.add_field('price', str(set_price))
 
-    add_static_response = await session.post("http://localhost:8000/producer/add-static-asset", data=form_data, headers=headers)
+    add_static_response = await session.post(f"{base_url}/producer/add-static-asset", data=form_data, headers=headers)
     if add_static_response.status == 200:
         static_asset_data = await add_static_response.json()
         logger.info("Static asset added: %s", static_asset_data)
@@ -75,7 +86,7 @@ async def data_producer_journey(session, headers):
         "stream_id": "test_stream_id"
     }
     
-    create_stream_response = await session.post("http://localhost:8000/producer/create-stream", 
+    create_stream_response = await session.post(f"{base_url}/producer/create-stream", 
                                                 json=stream_asset, 
                                                 headers=headers)
     if create_stream_response.status == 200:
@@ -88,7 +99,7 @@ async def data_producer_journey(session, headers):
 
     # List assets
     logger.info("Listing Assets:")
-    list_assets_response = await session.get("http://localhost:8000/producer/list-assets", headers=headers)
+    list_assets_response = await session.get(f"{base_url}/producer/list-assets", headers=headers)
     if list_assets_response.status == 200:
         assets_data = await list_assets_response.json()
         logger.info("Assets: %s", assets_data)
@@ -97,12 +108,12 @@ async def data_producer_journey(session, headers):
 
     return stream_asset_id, static_asset_id 
 
-async def data_consumer_journey(session, headers):
+async def data_consumer_journey(session, headers, base_url=BASE_URL):
     logger.info("--- Data Consumer Journey ---")
 
     # List available assets
     logger.info("Listing available assets:")
-    assets_response = await session.get("http://localhost:8000/consumer/list-assets", headers=headers)
+    assets_response = await session.get(f"{base_url}/consumer/list-assets", headers=headers)
     if assets_response.status == 200:
         assets = await assets_response.json()
         logger.info("Available assets: %s", json.dumps(assets, indent=2))
@@ -118,7 +129,7 @@ async def data_consumer_journey(session, headers):
     asset_to_purchase = assets['assets'][0]
     logger.info("Purchasing asset (ID: %s):", asset_to_purchase['id'])
     purchase_data = {"message": f"Purchase asset {asset_to_purchase['id']}"}
-    purchase_response = await session.post(f"http://localhost:8000/consumer/purchase-asset/{asset_to_purchase['id']}", 
+    purchase_response = await session.post(f"{base_url}/consumer/purchase-asset/{asset_to_purchase['id']}", 
                                            json=purchase_data, headers=headers)
     if purchase_response.status == 200:
         purchase_result = await purchase_response.json()
@@ -129,17 +140,17 @@ async def data_consumer_journey(session, headers):
 
     # List purchased assets
     logger.info("Listing purchased assets:")
-    my_assets_response = await session.get("http://localhost:8000/consumer/my-assets", headers=headers)
+    my_assets_response = await session.get(f"{base_url}/consumer/my-assets", headers=headers)
     if my_assets_response.status == 200:
         my_assets = await my_assets_response.json()
         logger.info("My assets: %s", json.dumps(my_assets, indent=2))
     else:
         logger.error("Failed to list purchased assets: %s", await my_assets_response.text())
 
-async def withdraw_revenue(session, headers):
+async def withdraw_revenue(session, headers, base_url=BASE_URL):
     logger.info("--- Withdrawing Revenue ---")
     
-    withdraw_response = await session.post("http://localhost:8000/producer/withdraw-revenue", headers=headers)
+    withdraw_response = await session.post(f"{base_url}/producer/withdraw-revenue", headers=headers)
     
     if withdraw_response.status == 200:
         withdraw_result = await withdraw_response.json()
@@ -165,23 +176,23 @@ async def withdraw_revenue(session, headers):
 
     logger.info("--- End of Withdrawal Process ---")
 
-async def main(producer_address, producer_key, consumer_address, consumer_key):
+async def main(producer_address, producer_key, consumer_address, consumer_key, base_url=BASE_URL):
     async with aiohttp.ClientSession() as session:
-        producer_wallet_info = await connect_and_authenticate(session, producer_address, producer_key)
-        consumer_wallet_info = await connect_and_authenticate(session, consumer_address, consumer_key)
+        producer_wallet_info = await connect_and_authenticate(session, producer_address, producer_key, base_url)
+        consumer_wallet_info = await connect_and_authenticate(session, consumer_address, consumer_key, base_url)
         
         if producer_wallet_info and consumer_wallet_info:
             # Producer journey
-            await data_producer_journey(session, producer_wallet_info)
+            await data_producer_journey(session, producer_wallet_info, base_url)
             
             # Consumer journey
-            await data_consumer_journey(session, consumer_wallet_info)
+            await data_consumer_journey(session, consumer_wallet_info, base_url)
 
             # Wait a bit to ensure transactions are processed
             await asyncio.sleep(15)
 
             # Producer withdraws revenue
-            await withdraw_revenue(session, producer_wallet_info)
+            await withdraw_revenue(session, producer_wallet_info, base_url)
         else:
             logger.error("Failed to authenticate wallets. Aborting demo.")
 
@@ -191,6 +202,7 @@ if __name__ == "__main__":
     parser.add_argument("--producer-key", required=True, help="Producer private key")
     parser.add_argument("--consumer-address", required=True, help="Consumer wallet address")
     parser.add_argument("--consumer-key", required=True, help="Consumer private key")
+    parser.add_argument("--base-url", default=BASE_URL, help="Core service URL")
     args = parser.parse_args()
 
-    asyncio.run(main(args.producer_address, args.producer_key, args.consumer_address, args.consumer_key))
\ No newline at end of file
+    asyncio.run(main(args.producer_address, args.producer_key, args.consumer_address, args.consumer_key, args.base_url))
\ No newline at end of file
@@ -1,6 +1,5 @@
 import os
 from dotenv import load_dotenv
-from web3 import Web3
 
 load_dotenv()
 
@@ -22,8 +21,81 @@ STORE_SERVICE_URL = os.getenv('STORE_SERVICE_URL', 'http://store:8001')
 STREAM_SERVICE_URL = os.getenv('STREAM_SERVICE_URL', 'http://stream:8002')
 TRANSACT_SERVICE_URL = os.getenv('TRANSACT_SERVICE_URL', 'http://transact:8003')
 
+# Stream subscription proofs are reused per (wallet, stream) until they expire
+SUBSCRIPTION_PROOF_TTL = int(os.getenv('SUBSCRIPTION_PROOF_TTL', '300'))
+SUBSCRIPTION_PROOF_CACHE_SIZE = int(os.getenv('SUBSCRIPTION_PROOF_CACHE_SIZE', '10000'))
+
+# Derived DID signing keys kept in memory for proof generation
+SIGNING_KEY_CACHE_SIZE = int(os.getenv('SIGNING_KEY_CACHE_SIZE', '10000'))
+SIGNING_KEY_CACHE_TTL = int(os.getenv('SIGNING_KEY_CACHE_TTL', '600'))
+
+# Resolved DID documents (did:key documents are cached until evicted) and not-found results
+DID_RESOLUTION_CACHE_SIZE = int(os.getenv('DID_RESOLUTION_CACHE_SIZE', '10000'))
+DID_RESOLUTION_CACHE_TTL = int(os.getenv('DID_RESOLUTION_CACHE_TTL', '3600'))
+DID_NEGATIVE_CACHE_TTL = int(os.getenv('DID_NEGATIVE_CACHE_TTL', '60'))
+
+# Key management: the master password is stretched with PBKDF2 once per process.
+# Set DERIVED_KEY to inject an already derived Fernet key, or DERIVED_KEY_HANDOFF_PATH
+# (ideally on tmpfs) so the first worker to derive it hands it to the others.
+KEY_MASTER_PASSWORD = os.getenv('KEY_MASTER_PASSWORD', 'master_password')
+KEY_FILE = os.getenv('KEY_FILE', 'keys.json')  # legacy JSON key file, imported into the key store on startup
+KEY_STORE_PATH = os.getenv('KEY_STORE_PATH', 'keys.db')
+DERIVED_KEY = os.getenv('DERIVED_KEY')
+DERIVED_KEY_HANDOFF_PATH = os.getenv('DERIVED_KEY_HANDOFF_PATH')
+
+# Stateless session tokens issued by /authenticate-wallet. Every worker and host must
+# share SESSION_SECRET; a comma-separated list allows rotation (the first one signs).
+SESSION_SECRETS = os.getenv('SESSION_SECRET', '')
+SESSION_TOKEN_TTL = int(os.getenv('SESSION_TOKEN_TTL', '3600'))
+
+# Connect-wallet nonces and in-process sessions: LRU-bounded, unauthenticated nonces expire fast
+SESSION_STORE_CAPACITY = int(os.getenv('SESSION_STORE_CAPACITY', '100000'))
+NONCE_TTL = int(os.getenv('NONCE_TTL', '300'))
+NONCE_STORE_CAPACITY = int(os.getenv('NONCE_STORE_CAPACITY', '100000'))
+SESSION_SWEEP_INTERVAL = int(os.getenv('SESSION_SWEEP_INTERVAL', '60'))
+
+# Concurrent /authenticate-wallet signature checks are recovered together in batches
+AUTH_BATCH_SIZE = int(os.getenv('AUTH_BATCH_SIZE', '64'))
+AUTH_BATCH_DELAY_MS = float(os.getenv('AUTH_BATCH_DELAY_MS', '2'))
+
+# Listed-asset catalog, shared by all workers through SQLite in WAL mode
+CATALOG_DB_PATH = os.getenv('CATALOG_DB_PATH', 'catalog.db')
+CATALOG_CACHE_SIZE = int(os.getenv('CATALOG_CACHE_SIZE', '100000'))
+CATALOG_PAGE_SIZE = int(os.getenv('CATALOG_PAGE_SIZE', '50'))
+CATALOG_MAX_PAGE_SIZE = int(os.getenv('CATALOG_MAX_PAGE_SIZE', '500'))
+# Serialized catalog responses, reused until the next catalog write
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '10000'))
+
+# Per-request stage tracing: Server-Timing header, and a structured trace log for a
+# sampled fraction of requests plus every request slower than TRACE_SLOW_MS
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0.01'))
+TRACE_SLOW_MS = float(os.getenv('TRACE_SLOW_MS', '1000'))
+
+# Per-request JSON-RPC audit: repeated identical calls are counted per route, and identical
+# eth_call/eth_chainId calls within one request hit the node once. The per-route report is
+# served on /debug/rpc-audit only when RPC_AUDIT_ENDPOINT is set; it is unauthenticated
+RPC_AUDIT_ENABLED = os.getenv('RPC_AUDIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RPC_MEMOIZE_READS = os.getenv('RPC_MEMOIZE_READS', 'true').lower() in ('1', 'true', 'yes')
+RPC_AUDIT_ENDPOINT = os.getenv('RPC_AUDIT_ENDPOINT', 'false').lower() in ('1', 'true', 'yes')
+
+# Logging goes through a bounded queue to a background thread; records are dropped, not
+# waited on, when it is full. LOG_SAMPLING keeps a fraction of sub-WARNING records per
+# logger prefix, e.g. 'src.marketplace=0.1,main=0.5'
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+LOG_SAMPLING = os.getenv('LOG_SAMPLING', '')
+
+# CPU-bound crypto (signing, DID creation) runs off the event loop: 'thread' or 'process'
+CRYPTO_EXECUTOR = os.getenv('CRYPTO_EXECUTOR', 'thread')
+CRYPTO_EXECUTOR_WORKERS = int(os.getenv('CRYPTO_EXECUTOR_WORKERS', '0'))  # 0 = one per CPU
+
+# Start-up warm-up, reported by /ready: failed steps are retried every WARMUP_RETRY_INTERVAL
+# seconds; the newest WARMUP_CATALOG_ASSETS assets are pre-loaded into the catalog cache
+WARMUP_RETRY_INTERVAL = float(os.getenv('WARMUP_RETRY_INTERVAL', '2'))
+WARMUP_CATALOG_ASSETS = int(os.getenv('WARMUP_CATALOG_ASSETS', '1000'))
+UPSTREAM_POOL_SIZE = int(os.getenv('UPSTREAM_POOL_SIZE', '100'))  # keep-alive connections to store/stream/transact
+
 def get_web3_url():
-    return NETWORK_URL
-    
-# Web3 setup
-w3 = Web3(Web3.HTTPProvider(NETWORK_URL))
\ No newline at end of file
+    return NETWORK_URL
\ No newline at end of file
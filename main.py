@@ -1,6 +1,7 @@
 import os
 import json
-from fastapi import FastAPI, HTTPException, Depends, Header, UploadFile, File, Form, Response
+import asyncio
+from fastapi import FastAPI, HTTPException, Depends, Header, UploadFile, File, Form, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from web3 import Web3
@@ -13,22 +14,52 @@ import secrets
 import traceback
 import binascii
 import time
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
 from src import did_manager
 from src.did_manager import generate_zkproof
-from src.marketplace import add_data_asset, purchase_data_asset, withdraw_revenue
-from config import get_web3_url, NETWORK_URL, CONTRACT_ADDRESS, CONTRACT_ABI, STORE_SERVICE_URL, STREAM_SERVICE_URL, TRANSACT_SERVICE_URL, PRODUCER_PRIVATE_KEY, CONSUMER_PRIVATE_KEY
+from src.executor import shutdown_executor
+from src.logging_setup import dropped_records, setup_logging, shutdown_logging
+from src.key_management import init_key_manager
+from src.catalog import AssetCatalog
+from src.response_cache import ResponseCache
+from src.responses import FastJSONResponse
+from src import instrumentation, metrics, rpc_audit
+from src.instrumentation import InstrumentedRoute
+from src.metrics import register_cache
+from src.readiness import Readiness
+from src.tracing import stage
+from src.session_store import SessionStore
+from src.session_tokens import issue_session_token, verify_session_token
+from src.wallet_auth import auth_message, auth_verifier
+from src.marketplace import add_data_asset, get_chain_id, purchase_data_asset, withdraw_revenue, web3
+from config import get_web3_url, NETWORK_URL, CONTRACT_ADDRESS, CONTRACT_ABI, STORE_SERVICE_URL, STREAM_SERVICE_URL, PRODUCER_PRIVATE_KEY, CONSUMER_PRIVATE_KEY, SESSION_TOKEN_TTL, SESSION_STORE_CAPACITY, NONCE_TTL, NONCE_STORE_CAPACITY, SESSION_SWEEP_INTERVAL, CATALOG_DB_PATH, CATALOG_CACHE_SIZE, CATALOG_PAGE_SIZE, CATALOG_MAX_PAGE_SIZE, RESPONSE_CACHE_SIZE, RPC_AUDIT_ENABLED, RPC_MEMOIZE_READS, RPC_AUDIT_ENDPOINT, WARMUP_RETRY_INTERVAL, WARMUP_CATALOG_ASSETS, UPSTREAM_POOL_SIZE
 from web3.exceptions import ContractLogicError
 
 from dotenv import load_dotenv
 
 load_dotenv() 
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Start-up work belongs here, not at import time, so importing main stays cheap
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Logging runs on a background thread, see src/logging_setup.py
+    setup_logging()
+    # Serves /health straight away; /ready reports 503 until the warm-up has finished
+    warmup = asyncio.create_task(readiness.run())
+    sweeper = asyncio.create_task(connected_wallets.run_sweeper(SESSION_SWEEP_INTERVAL))
+    yield
+    warmup.cancel()
+    sweeper.cancel()
+    await instrumentation.close_shared_session()
+    shutdown_executor()
+    shutdown_logging()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+# Per-route latency and in-flight metrics; must be set before any route is declared
+app.router.route_class = InstrumentedRoute
 
 # CORS middleware
 app.add_middleware(
@@ -37,17 +68,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Session-Token", "Server-Timing"],
 )
 
-# Web3 setup
-web3 = Web3(Web3.HTTPProvider(NETWORK_URL))
-
 def get_web3():
-    return Web3(Web3.HTTPProvider(get_web3_url()))
-
-# Simple in-memory wallet and asset stores
-connected_wallets = {}
-listed_assets = {}
+    # One provider, and so one HTTP connection pool, for the whole process (shared with src.marketplace)
+    return web3
+
+# In-memory wallet sessions (bounded, with TTL) and the persistent asset catalog
+connected_wallets = SessionStore(SESSION_STORE_CAPACITY, NONCE_TTL, SESSION_TOKEN_TTL, NONCE_STORE_CAPACITY)
+listed_assets = AssetCatalog(CATALOG_DB_PATH, cache_size=CATALOG_CACHE_SIZE)
+# Catalog read responses, served as cached bytes until the catalog version changes
+catalog_responses = ResponseCache(RESPONSE_CACHE_SIZE)
+
+# Read at scrape time only
+metrics.WALLET_SESSIONS.set_function(lambda: connected_wallets.stats()["live_sessions"])
+metrics.LOG_RECORDS_DROPPED.labels().set_function(dropped_records)
+register_cache("catalog", listed_assets.cache_stats)
+register_cache("catalog_responses", catalog_responses.stats)
+register_cache("signing_keys", did_manager.get_signing_key_cache_stats)
+register_cache("did_resolution", did_manager.get_did_resolution_cache_stats)
+register_cache("subscription_proofs", did_manager.get_subscription_proof_cache_stats)
+# Evictions here mean the store is at capacity and dropping nonces or logging wallets out
+register_cache("wallet_nonces", connected_wallets.nonce_cache_stats)
+register_cache("wallet_sessions", connected_wallets.session_cache_stats)
 
 # Model definitions
 class WalletConnect(BaseModel):
@@ -76,23 +120,109 @@ class PurchaseRequest(BaseModel):
 class StreamSubscriptionInput(BaseModel):
     stream_id: str
 
-def get_authenticated_wallet_address(wallet_address: str = Header(...)):
-    if wallet_address not in connected_wallets or not connected_wallets[wallet_address].get("authenticated"):
+class StreamBulkSubscriptionInput(BaseModel):
+    stream_ids: List[str]
+
+def get_authenticated_wallet_address(
+    request: Request,
+    wallet_address: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None)
+):
+    # Session tokens are verified without any lookup, so any worker can serve the request
+    if authorization and authorization.startswith("Bearer "):
+        claims = verify_session_token(authorization[len("Bearer "):])
+        if claims is None:
+            raise HTTPException(status_code=401, detail="Invalid or expired session token")
+        request.state.did = claims.get("did")
+        return claims["sub"]
+
+    # Legacy wallet-address header, only valid on the worker that authenticated the wallet
+    session = connected_wallets.get(wallet_address) if wallet_address else None
+    if session is None or not session.authenticated:
         raise HTTPException(status_code=401, detail="Wallet not authenticated")
+    request.state.did = session.did
     return wallet_address
 
+def get_authenticated_did(request: Request, wallet_address: str = Depends(get_authenticated_wallet_address)):
+    did = getattr(request.state, "did", None)
+    if not did:
+        raise HTTPException(status_code=400, detail=f"No DID associated with wallet {wallet_address}")
+    return did
+
+# (web3 instance, contract): parsing the ABI on every request is wasted work
+_contract = None
+
 def get_contract(w3: Web3 = Depends(get_web3)):
-    contract_abi = CONTRACT_ABI
-    contract_address = CONTRACT_ADDRESS
-    logger.info(f"Creating contract instance with address: {contract_address}")
-    contract = web3.eth.contract(address=contract_address, abi=contract_abi)
-    logger.info(f"Contract instance created: {contract}")
-    return contract
+    global _contract
+    if _contract is None or _contract[0] is not w3:
+        logger.debug("Creating contract instance with address: %s", CONTRACT_ADDRESS)
+        _contract = (w3, w3.eth.contract(address=CONTRACT_ADDRESS, abi=CONTRACT_ABI))
+        logger.debug("Contract instance created: %s", _contract[1])
+    return _contract[1]
+
+async def warm_chain():
+    chain_id = await asyncio.to_thread(get_chain_id)
+    # Request handlers call web3 from the event loop thread, and web3 pools connections per
+    # thread, so only a call made on this thread primes their pool. It blocks the loop, hence
+    # the short timeout; the node has just answered from the worker thread above
+    web3.provider.open_connection(timeout=1)
+    return {"chain_id": chain_id}
+
+async def warm_contract():
+    get_contract(web3)
+
+async def warm_catalog():
+    # On the event loop thread, which owns the SQLite connection requests will use
+    return {"assets": listed_assets.warm(WARMUP_CATALOG_ASSETS)}
+
+async def warm_upstreams():
+    # Only the services core calls on requests. Priming is best effort: an unreachable one is
+    # reported but does not hold back readiness, its requests fail on their own
+    session = instrumentation.open_shared_session(UPSTREAM_POOL_SIZE)
+    upstreams = {name: url for name, url in (("store", STORE_SERVICE_URL), ("stream", STREAM_SERVICE_URL)) if url}
+
+    async def probe(url):
+        # Any HTTP response will do, the point is a pooled keep-alive connection
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            return response.status
+
+    results = await asyncio.gather(*(probe(url) for url in upstreams.values()), return_exceptions=True)
+    statuses = {}
+    for name, result in zip(upstreams, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Could not reach {name} service during warm-up: {str(result) or type(result).__name__}")
+            statuses[name] = f"unreachable: {str(result) or type(result).__name__}"
+        else:
+            statuses[name] = result
+    return statuses
+
+readiness = Readiness(WARMUP_RETRY_INTERVAL)
+readiness.add("keys", init_key_manager)
+readiness.add("chain", warm_chain)
+readiness.add("contract", warm_contract)
+readiness.add("catalog", warm_catalog)
+readiness.add("upstreams", warm_upstreams)
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    # Readiness probe; /health stays the liveness probe
+    return FastJSONResponse(readiness.report(), status_code=200 if readiness.ready else 503)
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/debug/rpc-audit", include_in_schema=False)
+def rpc_audit_report(top: int = 20):
+    # Routes making the most repeated JSON-RPC calls, since startup
+    if not RPC_AUDIT_ENDPOINT:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {"enabled": RPC_AUDIT_ENABLED, "memoize_reads": RPC_MEMOIZE_READS, "routes": rpc_audit.report(top)}
+
 @app.get("/accounts")
 async def get_accounts(web3: Web3 = Depends(get_web3)):
     return {"accounts": web3.eth.accounts}
@@ -107,54 +237,60 @@ async def connect_wallet(wallet: WalletConnect):
     if not Web3.is_address(wallet.address):
         raise HTTPException(status_code=400, detail="Invalid wallet address")
     
-    nonce = secrets.token_hex(32)
-    connected_wallets[wallet.address] = {"nonce": nonce}
+    session = connected_wallets.connect(wallet.address)
     
-    return {"status": "connected", "wallet_address": wallet.address, "nonce": nonce}
+    return {"status": "connected", "wallet_address": wallet.address, "nonce": session.nonce}
 
 @app.post("/authenticate-wallet")
 async def authenticate_wallet(wallet_auth: WalletAuth):
-    if wallet_auth.address not in connected_wallets:
+    session = connected_wallets.get(wallet_auth.address)
+    if session is None:
         raise HTTPException(status_code=401, detail="Wallet not connected")
     
-    nonce = connected_wallets[wallet_auth.address]["nonce"]
-    message = f"Authenticate to Data Marketplace with nonce: {nonce}"
-    message_hash = encode_defunct(text=message)
+    nonce = session.nonce
+    message = auth_message(nonce)
     
     try:
-        w3 = Web3()  # Create a new Web3 instance
-        recovered_address = w3.eth.account.recover_message(message_hash, signature=wallet_auth.signature)
-        if recovered_address.lower() != wallet_auth.address.lower():
+        # Public-key recovery runs on the crypto executor, batched with concurrent logins
+        if not await auth_verifier.verify(wallet_auth.address, message, wallet_auth.signature):
             raise ValueError("Invalid signature")
         
-        # If we reach this point, the signature is valid
-        connected_wallets[wallet_auth.address]["authenticated"] = True
-        
         # Create a DID for the wallet if it doesn't exist
-        if "did" not in connected_wallets[wallet_auth.address]:
-            did, key = await did_manager.create_did()
-            connected_wallets[wallet_auth.address]["did"] = did
-            connected_wallets[wallet_auth.address]["did_key"] = key
+        did = did_key = None
+        if session.did is None:
+            did, did_key = await did_manager.create_did()
         
-        # Generate a new nonce for next authentication
-        connected_wallets[wallet_auth.address]["nonce"] = secrets.token_hex(32)
+        # If we reach this point, the signature is valid; this also generates a new nonce
+        # for the next authentication and extends the session's lifetime
+        if not connected_wallets.mark_authenticated(wallet_auth.address, session, nonce):
+            raise HTTPException(status_code=401, detail="Session changed during authentication, reconnect and try again")
+        if did is not None:
+            session.did, session.did_key = did, did_key
         
         return {
             "status": "authenticated",
             "wallet_address": wallet_auth.address,
-            "did": connected_wallets[wallet_auth.address]["did"],
-            "new_nonce": connected_wallets[wallet_auth.address]["nonce"]
+            "did": session.did,
+            "new_nonce": session.nonce,
+            "session_token": issue_session_token(wallet_auth.address, session.did),
+            "expires_in": SESSION_TOKEN_TTL
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Authentication failed: {str(e)}")
-        connected_wallets[wallet_auth.address]["authenticated"] = False
+        session.authenticated = False
         raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
 
 @app.post("/create-did")
-async def create_did_endpoint(wallet_address: str = Depends(get_authenticated_wallet_address)):
+async def create_did_endpoint(response: Response, wallet_address: str = Depends(get_authenticated_wallet_address)):
     try:
         did, key = await did_manager.create_did()
-        connected_wallets[wallet_address]["did"] = did
+        session = connected_wallets.get(wallet_address)
+        if session is not None:
+            session.did = did
+        # Session tokens carry the DID, hand out one that refers to the new DID
+        response.headers["X-Session-Token"] = issue_session_token(wallet_address, did)
         logger.info(f"Created DID: {did} for wallet: {wallet_address}")
         return {"did": did, "key": key}
     except Exception as e:
@@ -175,7 +311,7 @@ async def add_static_asset_endpoint(
     try:
         # Store the data first
         try:
-            async with aiohttp.ClientSession() as session:
+            async with instrumentation.upstream_session() as session:
                 form = aiohttp.FormData()
                 form.add_field('file', await file.read(), filename=file.filename)
                 async with session.post(f"{STORE_SERVICE_URL}/store", data=form) as response:
@@ -197,14 +333,15 @@ async def add_static_asset_endpoint(
             logger.error(error_msg)
             raise HTTPException(status_code=500, detail=error_msg)
         
-        listed_assets[asset_id] = {
-            "owner": wallet_address,
-            "name": name,
-            "description": description,
-            "price": price,
-            "is_stream": False,
-            "ipfs_hash": ipfs_hash
-        }
+        with stage("catalog_write"):
+            listed_assets.add(asset_id, {
+                "owner": wallet_address,
+                "name": name,
+                "description": description,
+                "price": price,
+                "is_stream": False,
+                "ipfs_hash": ipfs_hash
+            }, tx_hash=tx_hash)
         
         # Verify the asset was added correctly
         try:
@@ -238,12 +375,10 @@ async def list_assets_endpoint(
     wallet_address: str = Depends(get_authenticated_wallet_address)
 ):
     try:
-        user_assets = [
-            {"asset_id": asset_id, **asset_data}
-            for asset_id, asset_data in listed_assets.items()
-            if asset_data["owner"] == wallet_address
-        ]
-        return {"success": True, "assets": user_assets}
+        def build():
+            user_assets = [asset.to_dict() for _, asset in listed_assets.list_by_owner(wallet_address)]
+            return {"success": True, "assets": user_assets}
+        return catalog_responses.respond(("producer/list-assets", wallet_address), listed_assets.version, build)
     except Exception as e:
         logger.error(f"Error listing assets: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error listing assets: {str(e)}")
@@ -255,14 +390,18 @@ async def get_asset_endpoint(
     wallet_address: str = Depends(get_authenticated_wallet_address)
 ):
     try:
-        if asset_id not in listed_assets:
+        version = listed_assets.version
+        asset = listed_assets.get(asset_id)
+        if asset is None:
             raise HTTPException(status_code=404, detail="Asset not found")
         
-        asset = listed_assets[asset_id]
         if asset["owner"] != wallet_address:
             raise HTTPException(status_code=403, detail="You do not own this asset")
         
-        return {"success": True, "asset": {"asset_id": asset_id, **asset}}
+        return catalog_responses.respond(
+            ("producer/asset", asset_id), version,
+            lambda: {"success": True, "asset": asset.to_dict()}
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -276,10 +415,10 @@ async def retrieve_asset_content_endpoint(
     contract = Depends(get_contract)
 ):
     try:
-        if asset_id not in listed_assets:
+        asset = listed_assets.get(asset_id)
+        if asset is None:
             raise HTTPException(status_code=404, detail="Asset not found")
         
-        asset = listed_assets[asset_id]
         
         # Check ownership using the checkOwnership function
         try:
@@ -295,7 +434,7 @@ async def retrieve_asset_content_endpoint(
         
         # Retrieve the data from IPFS
         try:
-            async with aiohttp.ClientSession() as session:
+            async with instrumentation.upstream_session() as session:
                 async with session.post(f"{STORE_SERVICE_URL}/retrieve", json={"ipfs_hash": asset['ipfs_hash']}) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -325,12 +464,12 @@ async def delete_asset_endpoint(
     contract = Depends(get_contract)
 ):
     try:
-        if asset_id not in listed_assets:
+        asset = listed_assets.get(asset_id)
+        if asset is None:
             raise HTTPException(status_code=404, detail="Asset not found")
         
-        asset = listed_assets[asset_id]
-        logger.info(f"Asset owner from listed_assets: {asset['owner']}")
-        logger.info(f"Wallet address trying to delete: {wallet_address}")
+        logger.debug("Asset owner from listed_assets: %s", asset['owner'])
+        logger.debug("Wallet address trying to delete: %s", wallet_address)
         
         if asset["owner"] != wallet_address:
             raise HTTPException(status_code=403, detail="You do not own this asset")
@@ -338,9 +477,9 @@ async def delete_asset_endpoint(
         # Check ownership on the blockchain
 
         owner = contract.functions.getAssetOwner(asset_id).call()
-        logger.info(f"Asset owner from blockchain: {owner}")
+        logger.debug("Asset owner from blockchain: %s", owner)
         is_owner = contract.functions.checkOwnership(asset_id, wallet_address).call()
-        logger.info(f"Ownership check on blockchain: {is_owner}")
+        logger.debug("Ownership check on blockchain: %s", is_owner)
         
         if not is_owner:
             raise HTTPException(status_code=403, detail="Blockchain ownership check failed")
@@ -356,7 +495,7 @@ async def delete_asset_endpoint(
             
             # Build the transaction
             txn = contract.functions.removeAsset(asset_id).build_transaction({
-                'chainId': web3.eth.chain_id,
+                'chainId': get_chain_id(),
                 'gas': 2000000,
                 'gasPrice': web3.eth.gas_price,
                 'nonce': nonce,
@@ -364,14 +503,16 @@ async def delete_asset_endpoint(
             })
             
             # Sign the transaction
-            signed_txn = web3.eth.account.sign_transaction(txn, private_key=WALLET_PRIVATE_KEY)
+            with stage("sign_tx"):
+                signed_txn = web3.eth.account.sign_transaction(txn, private_key=WALLET_PRIVATE_KEY)
             
             # Send the transaction
             tx_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
             logger.debug(f"Transaction hash: {tx_hash.hex()}")
             
             # Wait for the transaction receipt
-            tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+            with stage("wait_receipt"):
+                tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
             logger.debug(f"Transaction receipt: {tx_receipt}")
             
             if tx_receipt['status'] == 0:
@@ -383,12 +524,13 @@ async def delete_asset_endpoint(
             raise HTTPException(status_code=500, detail=error_msg)
         
         # Remove asset from local storage
-        del listed_assets[asset_id]
+        with stage("catalog_write"):
+            listed_assets.delete(asset_id)
         
         # If it's a static asset, remove from IPFS
         if not asset["is_stream"]:
             try:
-                async with aiohttp.ClientSession() as session:
+                async with instrumentation.upstream_session() as session:
                     async with session.post(f"{STORE_SERVICE_URL}/delete", json={"ipfs_hash": asset['ipfs_hash']}) as response:
                         if response.status != 200:
                             logger.warning(f"Failed to delete asset data from IPFS: {await response.text()}")
@@ -413,14 +555,14 @@ async def create_stream_endpoint(
     contract = Depends(get_contract)
 ):
     try:
-        async with aiohttp.ClientSession() as session:
+        async with instrumentation.upstream_session() as session:
             async with session.post(f"{STREAM_SERVICE_URL}/create", json={
                 "name": stream_input.name,
                 "description": stream_input.description,
                 "price": stream_input.price,
                 "owner_address": wallet_address
             }) as response:
-                logger.info(f"Stream creation response: {response}")
+                logger.debug("Stream creation response: %s", response)
                 if response.status == 200:
                     stream_response = await response.json()
                 else:
@@ -461,12 +603,12 @@ async def publish_stream_endpoint(
         # message = f"{wallet_address}:{stream_id}:{timestamp}"
         # proof = await generate_zkproof(did, message)
 
-        async with aiohttp.ClientSession() as session:
+        async with instrumentation.upstream_session() as session:
             async with session.post(f"{STREAM_SERVICE_URL}/publish", json={
                 "stream_id": stream_id,
                 "data": stream_data
             }) as response:
-                logger.info(f"Stream publish response: {response}")
+                logger.debug("Stream publish response: %s", response)
                 if response.status == 200:
                     return await response.json()
                 else:
@@ -478,40 +620,71 @@ async def publish_stream_endpoint(
 
 # Consumer endpoints
 @app.get("/consumer/list-assets")
-async def list_assets_for_consumer(wallet_address: str = Depends(get_authenticated_wallet_address)):
+async def list_assets_for_consumer(
+    limit: int = Query(CATALOG_PAGE_SIZE, ge=1, le=CATALOG_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: str = "id_asc",
+    min_price: Optional[int] = Query(None, ge=0),
+    max_price: Optional[int] = Query(None, ge=0),
+    is_stream: Optional[bool] = None,
+    owner: Optional[str] = None,
+    wallet_address: str = Depends(get_authenticated_wallet_address)
+):
+    def build():
+        page, next_cursor = listed_assets.page(
+            limit, cursor=cursor, sort=sort, min_price=min_price, max_price=max_price,
+            is_stream=is_stream, owner=owner
+        )
+        assets = [asset.to_listing() for _, asset in page]
+        return {"success": True, "assets": assets, "next_cursor": next_cursor}
+
+    key = ("consumer/list-assets", limit, cursor, sort, min_price, max_price, is_stream, owner)
     try:
-        assets = []
-        for asset_id, asset_data in listed_assets.items():
-            assets.append({
-                "id": asset_id,
-                "name": asset_data["name"],
-                "description": asset_data["description"],
-                "price": asset_data["price"],
-                "owner": asset_data["owner"],
-                "is_stream": asset_data["is_stream"]
-            })
-        return {"success": True, "assets": assets}
+        return catalog_responses.respond(key, listed_assets.version, build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing assets: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error listing assets: {str(e)}")    
 
 
+@app.get("/consumer/search")
+async def search_assets(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(CATALOG_PAGE_SIZE, ge=1, le=CATALOG_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    wallet_address: str = Depends(get_authenticated_wallet_address)
+):
+    def build():
+        hits, next_cursor, truncated = listed_assets.search(q, limit, cursor=cursor)
+        assets = [asset.to_listing() for _, asset in hits]
+        return {"success": True, "assets": assets, "next_cursor": next_cursor, "truncated": truncated}
+
+    try:
+        return catalog_responses.respond(("consumer/search", q, limit, cursor), listed_assets.version, build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching assets: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error searching assets: {str(e)}")
+
+
 @app.post("/consumer/purchase-asset/{asset_id}")
 async def purchase_asset(
     asset_id: int,
     wallet_address: str = Depends(get_authenticated_wallet_address),
+    did: str = Depends(get_authenticated_did),
     contract = Depends(get_contract)
 ):
     try:
-        if asset_id not in listed_assets:
+        asset = listed_assets.get(asset_id)
+        if asset is None:
             raise HTTPException(status_code=404, detail="Asset not found")
         
-        asset = listed_assets[asset_id]
         if asset["owner"] == wallet_address:
             raise HTTPException(status_code=400, detail="You already own this asset")
 
         # Generate ZKP
-        did = connected_wallets[wallet_address]["did"]
         message = f"Purchase asset {asset_id}"
         proof = await generate_zkproof(did, message)
 
@@ -519,7 +692,8 @@ async def purchase_asset(
         tx_hash = purchase_data_asset(contract, asset_id, wallet_address, asset["price"], proof)
         
         # Update local asset data
-        asset["owner"] = wallet_address
+        with stage("catalog_write"):
+            listed_assets.transfer(asset_id, wallet_address, tx_hash=tx_hash)
         
         return {"success": True, "tx_hash": tx_hash}
     except ContractLogicError as e:
@@ -532,11 +706,7 @@ async def purchase_asset(
 @app.get("/consumer/my-assets")
 async def list_purchased_assets(wallet_address: str = Depends(get_authenticated_wallet_address)):
     try:
-        owned_assets = [
-            {"asset_id": asset_id, **asset_data}
-            for asset_id, asset_data in listed_assets.items()
-            if asset_data["owner"] == wallet_address
-        ]
+        owned_assets = [asset.to_dict() for _, asset in listed_assets.list_by_owner(wallet_address)]
         return {"success": True, "assets": owned_assets}
     except Exception as e:
         logger.error(f"Error listing purchased assets: {str(e)}")
@@ -549,10 +719,10 @@ async def get_asset_content(
     contract = Depends(get_contract)
 ):
     try:
-        if asset_id not in listed_assets:
+        asset = listed_assets.get(asset_id)
+        if asset is None:
             raise HTTPException(status_code=404, detail="Asset not found")
         
-        asset = listed_assets[asset_id]
         
         # Check ownership using the smart contract
         is_owner = contract.functions.checkOwnership(asset_id, wallet_address).call()
@@ -563,7 +733,7 @@ async def get_asset_content(
             return {"stream_id": asset['stream_id']}
         else:
             # Retrieve static asset content from IPFS
-            async with aiohttp.ClientSession() as session:
+            async with instrumentation.upstream_session() as session:
                 async with session.post(f"{STORE_SERVICE_URL}/retrieve", json={"ipfs_hash": asset['ipfs_hash']}) as response:
                     if response.status == 200:
                         content = await response.read()
@@ -599,28 +769,70 @@ async def withdraw_revenue_endpoint(
 @app.post("/consumer/subscribe-stream")
 async def subscribe_stream_endpoint(
     subscription: StreamSubscriptionInput,
-    wallet_address: str = Depends(get_authenticated_wallet_address)
+    wallet_address: str = Depends(get_authenticated_wallet_address),
+    did: str = Depends(get_authenticated_did)
 ):
     try:
         logger.info(f"Attempting to subscribe to stream {subscription.stream_id} for wallet {wallet_address}")
         
-        did = connected_wallets[wallet_address]["did"]
-        timestamp = int(time.time())
-        message = f"{wallet_address}:{subscription.stream_id}:{timestamp}"
-        proof = await generate_zkproof(did, message)
+        proofs = await did_manager.get_subscription_proofs(did, wallet_address, [subscription.stream_id])
+        proof = proofs[subscription.stream_id]
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{STREAM_SERVICE_URL}/subscribe/{subscription.stream_id,}", json={
+        async with instrumentation.upstream_session() as session:
+            async with session.post(f"{STREAM_SERVICE_URL}/subscribe/{subscription.stream_id}", json={
                 "did": did,
                 "proof": proof
             }) as response:
                 if response.status == 200:
                     return await response.json()
                 else:
+                    if response.status in (401, 403):
+                        # The stream service rejected the cached proof, sign a fresh one next time
+                        did_manager.invalidate_subscription_proofs(did, wallet_address, [subscription.stream_id])
                     raise HTTPException(status_code=response.status, detail=await response.text())
     except Exception as e:
         logger.error(f"Error subscribing to stream: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error subscribing to stream: {str(e)}")
+
+@app.post("/consumer/subscribe-streams")
+async def subscribe_streams_endpoint(
+    subscription: StreamBulkSubscriptionInput,
+    wallet_address: str = Depends(get_authenticated_wallet_address),
+    did: str = Depends(get_authenticated_did)
+):
+    try:
+        if not subscription.stream_ids:
+            raise HTTPException(status_code=400, detail="No stream IDs provided")
+
+        logger.info(f"Attempting to subscribe to {len(subscription.stream_ids)} streams for wallet {wallet_address}")
+
+        proofs = await did_manager.get_subscription_proofs(did, wallet_address, subscription.stream_ids)
+
+        async with instrumentation.upstream_session() as session:
+            async def subscribe(stream_id: str):
+                async with session.post(f"{STREAM_SERVICE_URL}/subscribe/{stream_id}", json={
+                    "did": did,
+                    "proof": proofs[stream_id]
+                }) as response:
+                    if response.status == 200:
+                        return {"success": True, "subscription": await response.json()}
+                    if response.status in (401, 403):
+                        did_manager.invalidate_subscription_proofs(did, wallet_address, [stream_id])
+                    return {"success": False, "status": response.status, "detail": await response.text()}
+
+            stream_ids = list(proofs)
+            results = await asyncio.gather(*(subscribe(stream_id) for stream_id in stream_ids))
+
+        subscriptions = dict(zip(stream_ids, results))
+        return {
+            "success": all(result["success"] for result in results),
+            "subscriptions": subscriptions
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error subscribing to streams: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error subscribing to streams: {str(e)}")
     
 @app.get("/consumer/access-static-asset/{asset_id}")
 async def access_static_asset_endpoint(
@@ -629,10 +841,10 @@ async def access_static_asset_endpoint(
     contract = Depends(get_contract)
 ):
     try:
-        if asset_id not in listed_assets:
+        asset = listed_assets.get(asset_id)
+        if asset is None:
             raise HTTPException(status_code=404, detail="Asset not found")
         
-        asset = listed_assets[asset_id]
         
         if asset['is_stream']:
             raise HTTPException(status_code=400, detail="This endpoint is for static assets only")
@@ -648,7 +860,7 @@ async def access_static_asset_endpoint(
         
         # Retrieve the data from IPFS
         try:
-            async with aiohttp.ClientSession() as session:
+            async with instrumentation.upstream_session() as session:
                 async with session.post(f"{STORE_SERVICE_URL}/retrieve", json={"ipfs_hash": asset['ipfs_hash'], "output_path": "temp_file"}) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -677,6 +889,7 @@ async def purchase_data_asset_endpoint(
     asset_id: int,
     purchase_request: PurchaseRequest,
     wallet_address: str = Depends(get_authenticated_wallet_address),
+    did: str = Depends(get_authenticated_did),
     contract = Depends(get_contract)
 ):
     try:
@@ -684,7 +897,6 @@ async def purchase_data_asset_endpoint(
         
         # Generate ZKP
         try:
-            did = connected_wallets[wallet_address]["did"]
             proof = await generate_zkproof(did, purchase_request.message)
         except Exception as e:
             logger.error(f"Error generating ZKProof: {str(e)}")
@@ -704,10 +916,10 @@ async def access_stream_endpoint(
     contract = Depends(get_contract)
 ):
     try:
-        if asset_id not in listed_assets:
+        asset = listed_assets.get(asset_id)
+        if asset is None:
             raise HTTPException(status_code=404, detail="Asset not found")
         
-        asset = listed_assets[asset_id]
         
         if not asset['is_stream']:
             raise HTTPException(status_code=400, detail="This endpoint is for stream assets only")
@@ -1,73 +1,254 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+"""Local simulators for the store (IPFS/Pinata), stream (Streamr), transact and chain RPC services.
+
+Every service injects its own latency distribution, error rate and bandwidth limit, so core
+can be benchmarked reproducibly offline. Profiles are set with --profile / SIM_PROFILES
+(';'-separated) and can be changed at runtime through PUT /sim/config:
+
+    python mock_services.py --port 8001 --seed 7 \\
+        --profile store.latency=lognormal:median=120,sigma=0.6 \\
+        --profile store.bandwidth=20MB --profile store.error_rate=0.01 \\
+        --profile rpc.latency=uniform:low=2,high=15 --rpc-upstream http://127.0.0.1:8545
+
+Latency specs are in milliseconds: "40" (constant), "uniform:low=,high=", "normal:mean=,stddev=",
+"lognormal:median=,sigma=" or "pareto:scale=,alpha=", each with an optional max=.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
 import json
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+import logging
+import math
+import os
+import random
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
-# Mock Store Service
-class StoreRequest(BaseModel):
-    file_path: str
+SERVICES = ("store", "stream", "transact", "rpc")
+BANDWIDTH_UNITS = {"": 1, "B": 1, "KB": 1e3, "MB": 1e6, "GB": 1e9}
+
+rng = random.Random(int(os.getenv("SIM_SEED", "0")) or None)
+RPC_UPSTREAM = os.getenv("SIM_RPC_UPSTREAM", "http://127.0.0.1:8545")
+STREAM_QUEUE_SIZE = int(os.getenv("SIM_STREAM_QUEUE_SIZE", "1000"))
+
+
+def parse_latency(spec: str) -> Dict[str, Any]:
+    spec = str(spec).strip()
+    if spec in ("", "0", "none"):
+        return {"kind": "constant", "ms": 0.0}
+    if ":" not in spec:
+        return {"kind": "constant", "ms": float(spec)}
+    kind, _, params = spec.partition(":")
+    parsed = {"kind": kind}
+    for param in params.split(","):
+        key, _, value = param.partition("=")
+        parsed[key.strip()] = float(value)
+    required = {
+        "constant": ("ms",), "uniform": ("low", "high"), "normal": ("mean", "stddev"),
+        "lognormal": ("median", "sigma"), "pareto": ("scale", "alpha"),
+    }
+    if kind not in required or any(key not in parsed for key in required[kind]):
+        raise ValueError(f"Invalid latency spec: {spec}")
+    return parsed
+
+
+def sample_latency(latency: Dict[str, Any]) -> float:
+    # Seconds
+    kind = latency["kind"]
+    if kind == "constant":
+        ms = latency["ms"]
+    elif kind == "uniform":
+        ms = rng.uniform(latency["low"], latency["high"])
+    elif kind == "normal":
+        ms = rng.gauss(latency["mean"], latency["stddev"])
+    elif kind == "lognormal":
+        ms = rng.lognormvariate(math.log(latency["median"]), latency["sigma"])
+    else:
+        ms = latency["scale"] * rng.paretovariate(latency["alpha"])
+    if "max" in latency:
+        ms = min(ms, latency["max"])
+    return max(ms, 0.0) / 1000
+
 
+def parse_bandwidth(value: str) -> float:
+    # Bytes per second; 0 means unlimited
+    value = str(value).strip().upper().removesuffix("/S")
+    number = value.rstrip("KMGB")
+    return float(number or 0) * BANDWIDTH_UNITS[value[len(number):]]
+
+
+def default_profile() -> Dict[str, Any]:
+    return {"latency": parse_latency("0"), "error_rate": 0.0, "error_status": 503, "timeout_rate": 0.0, "bandwidth": 0.0}
+
+
+profiles: Dict[str, Dict[str, Any]] = {service: default_profile() for service in SERVICES}
+stats: Dict[str, Dict[str, float]] = {service: defaultdict(float) for service in SERVICES}
+
+
+def set_profile(assignment: str) -> None:
+    # "<service>.<field>=<value>", e.g. "store.latency=lognormal:median=80,sigma=0.5"
+    key, _, value = assignment.partition("=")
+    service, _, field = key.strip().partition(".")
+    if service not in profiles:
+        raise ValueError(f"Unknown service {service!r}, expected one of {SERVICES}")
+    if field == "latency":
+        profiles[service]["latency"] = parse_latency(value)
+    elif field == "bandwidth":
+        profiles[service]["bandwidth"] = parse_bandwidth(value)
+    elif field in ("error_rate", "timeout_rate"):
+        profiles[service][field] = float(value)
+    elif field == "error_status":
+        profiles[service][field] = int(value)
+    else:
+        raise ValueError(f"Unknown profile field {field!r}")
+
+
+async def simulate(service: str, payload_bytes: int = 0) -> None:
+    # Latency, then bandwidth-limited transfer time, then injected failures
+    profile, counters = profiles[service], stats[service]
+    counters["requests"] += 1
+    counters["bytes"] += payload_bytes
+    delay = sample_latency(profile["latency"])
+    if profile["bandwidth"] and payload_bytes:
+        delay += payload_bytes / profile["bandwidth"]
+    if delay:
+        await asyncio.sleep(delay)
+    roll = rng.random()
+    if roll < profile["timeout_rate"]:
+        counters["timeouts"] += 1
+        # Longer than any sane client timeout
+        await asyncio.sleep(3600)
+    if roll < profile["timeout_rate"] + profile["error_rate"]:
+        counters["errors"] += 1
+        raise HTTPException(status_code=profile["error_status"], detail=f"Simulated {service} failure")
+
+
+# Store service: content-addressed bytes held in memory
 class RetrieveRequest(BaseModel):
     ipfs_hash: str
+    output_path: Optional[str] = None
 
-stored_data = {}
-
-def mock_get_public_key_from_did(did: str) -> bytes:
-    # In a real implementation, this would fetch the public key from a DID resolver
-    # For mock purposes, we'll use a fixed public key
-    return bytes.fromhex("0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef")
+stored_data: Dict[str, bytes] = {}
 
 @app.post("/store")
-async def store_data(request: StoreRequest):
-    ipfs_hash = f"Qm...{len(stored_data)}"
-    stored_data[ipfs_hash] = request.file_path
-    return {"ipfs_hash": ipfs_hash}
+async def store_data(file: UploadFile = File(...)):
+    content = await file.read()
+    await simulate("store", len(content))
+    ipfs_hash = "Qm" + hashlib.sha256(content).hexdigest()[:44]
+    stored_data[ipfs_hash] = content
+    return {"ipfs_hash": ipfs_hash, "size": len(content)}
 
 @app.post("/retrieve")
 async def retrieve_data(request: RetrieveRequest):
-    if request.ipfs_hash not in stored_data:
+    content = stored_data.get(request.ipfs_hash)
+    await simulate("store", len(content or b""))
+    if content is None:
+        raise HTTPException(status_code=404, detail="Data not found")
+    if request.output_path:
+        # Core's access-static-asset endpoint reads the content back from this path
+        with open(request.output_path, "wb") as f:
+            f.write(content)
+        return {"success": True, "size": len(content)}
+    try:
+        return {"success": True, "data": content.decode(), "encoding": "utf-8"}
+    except UnicodeDecodeError:
+        return {"success": True, "data": base64.b64encode(content).decode(), "encoding": "base64"}
+
+@app.post("/delete")
+async def delete_data(request: RetrieveRequest):
+    await simulate("store")
+    if stored_data.pop(request.ipfs_hash, None) is None:
         raise HTTPException(status_code=404, detail="Data not found")
-    return {"data": stored_data[request.ipfs_hash]}
+    return {"success": True}
+
+
+# Stream service: every published message is fanned out to each subscription's queue
+class CreateStreamRequest(BaseModel):
+    name: str
+    description: str = ""
+    price: int = 0
+    owner_address: str
 
-# Mock Stream Service
-class StreamRequest(BaseModel):
-    streamId: str
+class PublishRequest(BaseModel):
+    stream_id: str
+    data: Any
+
+class SubscribeRequest(BaseModel):
     did: str
     proof: str
 
+streams: Dict[str, Dict[str, Any]] = {}
+subscriptions: Dict[str, deque] = {}
+_stream_ids = itertools.count(1)
+_subscription_ids = itertools.count(1)
+_new_messages: Dict[str, asyncio.Event] = defaultdict(asyncio.Event)
+
+@app.post("/create")
+async def create_stream(request: CreateStreamRequest):
+    await simulate("stream")
+    stream_id = str(next(_stream_ids))
+    streams[stream_id] = {"owner": request.owner_address, "name": request.name, "subscribers": set(), "published": 0}
+    return {"stream_id": stream_id}
+
 @app.post("/publish")
-async def publish_stream(request: StreamRequest):
-    return {"status": "published"}
+async def publish_stream(request: PublishRequest):
+    message = json.dumps({"stream_id": request.stream_id, "data": request.data, "published_at": time.time()})
+    stream = streams.get(request.stream_id)
+    fan_out = len(stream["subscribers"]) if stream else 0
+    # Each subscriber receives its own copy
+    await simulate("stream", len(message) * max(fan_out, 1))
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Stream not found")
+    stream["published"] += 1
+    for subscription_id in stream["subscribers"]:
+        queue = subscriptions[subscription_id]
+        if len(queue) == queue.maxlen:
+            stats["stream"]["dropped"] += 1
+        queue.append(message)
+        _new_messages[subscription_id].set()
+    return {"status": "published", "delivered": fan_out}
 
-@app.post("/subscribe")
-async def subscribe_stream(request: StreamRequest):
-    try:
-        proof_obj = json.loads(request.proof)
-        public_key = mock_get_public_key_from_did(request.did)
-        
-        r = int(proof_obj["r"], 16)
-        s = int(proof_obj["s"], 16)
-        message = proof_obj["message"].encode()
-        
-        public_key_obj = ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), public_key)
-        
+@app.post("/subscribe/{stream_id}")
+async def subscribe_stream(stream_id: str, request: SubscribeRequest):
+    await simulate("stream")
+    if not request.proof:
+        raise HTTPException(status_code=403, detail="Invalid proof")
+    stream = streams.setdefault(stream_id, {"owner": None, "name": stream_id, "subscribers": set(), "published": 0})
+    subscription_id = str(next(_subscription_ids))
+    subscriptions[subscription_id] = deque(maxlen=STREAM_QUEUE_SIZE)
+    stream["subscribers"].add(subscription_id)
+    return {"status": "subscribed", "stream_id": stream_id, "subscription_id": subscription_id}
+
+@app.get("/poll/{subscription_id}")
+async def poll_subscription(subscription_id: str, timeout: float = 10.0, max_messages: int = 100):
+    # Long-poll: returns as soon as messages are queued, or empty after timeout seconds
+    queue = subscriptions.get(subscription_id)
+    if queue is None:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    if not queue:
+        event = _new_messages[subscription_id]
+        event.clear()
         try:
-            public_key_obj.verify(
-                encode_dss_signature(r, s),
-                message,
-                ec.ECDSA(hashes.SHA256())
-            )
-            return {"status": "subscribed", "streamId": request.streamId}
-        except:
-            raise HTTPException(status_code=403, detail="Invalid proof")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Mock Transact Service
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    messages = [json.loads(queue.popleft()) for _ in range(min(max_messages, len(queue)))]
+    await simulate("stream", sum(len(json.dumps(message)) for message in messages))
+    return {"messages": messages}
+
+
+# Transact service
 class DeployRequest(BaseModel):
     fromAddress: str
 
@@ -80,12 +261,82 @@ class InteractRequest(BaseModel):
 
 @app.post("/deploy")
 async def deploy_contract(request: DeployRequest):
-    return {"contractAddress": "0x1234567890123456789012345678901234567890"}
+    await simulate("transact")
+    return {"contractAddress": "0x" + hashlib.sha256(request.fromAddress.encode()).hexdigest()[:40]}
 
 @app.post("/interact")
 async def interact_with_contract(request: InteractRequest):
-    return {"txHash": "0x9876543210987654321098765432109876543210"}
+    await simulate("transact")
+    return {"txHash": "0x" + os.urandom(32).hex()}
+
+
+# Chain RPC: a JSON-RPC proxy in front of ganache; failures are JSON-RPC errors, as a node returns them
+_rpc_session: Optional[aiohttp.ClientSession] = None
+
+def _rpc_error(call: Dict[str, Any]) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": call.get("id"), "error": {"code": -32000, "message": "Simulated RPC failure"}}
+
+@app.post("/rpc")
+async def rpc_proxy(request: Request):
+    global _rpc_session
+    body = await request.body()
+    payload = json.loads(body)
+    calls = payload if isinstance(payload, list) else [payload]
+    try:
+        await simulate("rpc", len(body))
+    except HTTPException:
+        errors = [_rpc_error(call) for call in calls]
+        return JSONResponse(errors if isinstance(payload, list) else errors[0])
+    for call in calls:
+        stats["rpc"][f"method:{call.get('method')}"] += 1
+    if _rpc_session is None:
+        _rpc_session = aiohttp.ClientSession()
+    async with _rpc_session.post(RPC_UPSTREAM, data=body, headers={"Content-Type": "application/json"}) as response:
+        return JSONResponse(await response.json(content_type=None), status_code=response.status)
+
+
+# Simulator control
+@app.get("/sim/config")
+async def get_config():
+    return profiles
+
+@app.put("/sim/config")
+async def update_config(assignments: List[str]):
+    try:
+        for assignment in assignments:
+            set_profile(assignment)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return profiles
+
+@app.get("/sim/stats")
+async def get_stats():
+    return {
+        "services": stats,
+        "stored_objects": len(stored_data),
+        "stored_bytes": sum(len(content) for content in stored_data.values()),
+        "streams": len(streams),
+        "subscriptions": len(subscriptions),
+    }
+
+
+for _assignment in filter(None, os.getenv("SIM_PROFILES", "").split(";")):
+    set_profile(_assignment)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="localhost", port=8001)
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--seed", type=int, help="Seed for reproducible latency and failure sequences")
+    parser.add_argument("--profile", action="append", default=[], help="<service>.<field>=<value>, repeatable")
+    parser.add_argument("--rpc-upstream", default=RPC_UPSTREAM, help="Chain node behind /rpc (ganache)")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        rng.seed(args.seed)
+    for assignment in args.profile:
+        set_profile(assignment)
+    RPC_UPSTREAM = args.rpc_upstream
+    uvicorn.run(app, host=args.host, port=args.port)
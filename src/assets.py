@@ -0,0 +1,94 @@
+import sys
+from typing import Any, Dict, Iterator, Optional
+
+FIELDS = ("owner", "name", "description", "price", "is_stream", "ipfs_hash", "stream_id")
+# Absent for some assets: static assets have no stream_id, streams no ipfs_hash
+OPTIONAL_FIELDS = ("ipfs_hash", "stream_id")
+
+
+class AssetRecord:
+    """A listed asset; slotted so that millions of cached records stay compact."""
+
+    __slots__ = ("asset_id",) + FIELDS
+
+    def __init__(
+        self,
+        asset_id: int,
+        owner: str,
+        name: str,
+        description: str,
+        price: int,
+        is_stream: bool,
+        ipfs_hash: Optional[str] = None,
+        stream_id: Optional[str] = None
+    ):
+        self.asset_id = asset_id
+        # A handful of wallets own most assets, so owners share one string each
+        self.owner = sys.intern(owner)
+        self.name = name
+        self.description = description
+        self.price = price
+        self.is_stream = is_stream
+        self.ipfs_hash = ipfs_hash
+        self.stream_id = stream_id
+
+    @classmethod
+    def from_row(cls, row) -> "AssetRecord":
+        asset_id, owner, name, description, price, is_stream, ipfs_hash, stream_id = row
+        return cls(asset_id, owner, name, description, int(price), bool(is_stream), ipfs_hash, stream_id)
+
+    # Read-only mapping access, so records drop in where asset dicts were used
+    def __getitem__(self, key: str) -> Any:
+        if key not in FIELDS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key in OPTIONAL_FIELDS:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> Iterator[str]:
+        return (key for key in FIELDS if key not in OPTIONAL_FIELDS or getattr(self, key) is not None)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, AssetRecord):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"AssetRecord(asset_id={self.asset_id!r}, owner={self.owner!r}, name={self.name!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Producer-facing shape: every stored field, keyed by asset_id
+        asset = {
+            "asset_id": self.asset_id,
+            "owner": self.owner,
+            "name": self.name,
+            "description": self.description,
+            "price": self.price,
+            "is_stream": self.is_stream,
+        }
+        if self.ipfs_hash is not None:
+            asset["ipfs_hash"] = self.ipfs_hash
+        if self.stream_id is not None:
+            asset["stream_id"] = self.stream_id
+        return asset
+
+    def to_listing(self) -> Dict[str, Any]:
+        # Consumer-facing shape, without storage details
+        return {
+            "id": self.asset_id,
+            "name": self.name,
+            "description": self.description,
+            "price": self.price,
+            "owner": self.owner,
+            "is_stream": self.is_stream,
+        }
@@ -0,0 +1,379 @@
+import base64
+import json
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .assets import AssetRecord
+from .cache import TTLCache
+from .db import SQLiteDatabase
+
+logger = logging.getLogger(__name__)
+
+# Prices are wei amounts that can exceed SQLite's 64-bit integers, so they are stored
+# as fixed-width decimal strings (uint256 fits in 78 digits) which sort numerically
+PRICE_WIDTH = 78
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    asset_id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    price TEXT NOT NULL,
+    is_stream INTEGER NOT NULL,
+    ipfs_hash TEXT,
+    stream_id TEXT,
+    tx_hash TEXT,
+    updated_at INTEGER NOT NULL DEFAULT (strftime('%s', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_assets_owner ON assets(owner, asset_id);
+CREATE INDEX IF NOT EXISTS idx_assets_is_stream ON assets(is_stream, asset_id);
+CREATE INDEX IF NOT EXISTS idx_assets_price ON assets(price, asset_id);
+CREATE INDEX IF NOT EXISTS idx_assets_owner_price ON assets(owner, price, asset_id);
+CREATE INDEX IF NOT EXISTS idx_assets_is_stream_price ON assets(is_stream, price, asset_id);
+
+-- Full-text index over name and description, kept in sync by triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(
+    name, description, content='assets', content_rowid='asset_id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+);
+CREATE TRIGGER IF NOT EXISTS assets_fts_insert AFTER INSERT ON assets BEGIN
+    INSERT INTO assets_fts(rowid, name, description) VALUES (new.asset_id, new.name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS assets_fts_delete AFTER DELETE ON assets BEGIN
+    INSERT INTO assets_fts(assets_fts, rowid, name, description) VALUES ('delete', old.asset_id, old.name, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS assets_fts_update AFTER UPDATE OF name, description ON assets BEGIN
+    INSERT INTO assets_fts(assets_fts, rowid, name, description) VALUES ('delete', old.asset_id, old.name, old.description);
+    INSERT INTO assets_fts(rowid, name, description) VALUES (new.asset_id, new.name, new.description);
+END;
+"""
+
+# bm25 column weights: matches in the name rank above matches in the description
+SEARCH_WEIGHTS = (10.0, 1.0)
+# Scoring every match of a very common term is what makes ranked search slow, so only
+# the newest matches up to this many are ranked; rarer queries are ranked exactly
+SEARCH_MAX_CANDIDATES = 5000
+
+COLUMNS = "asset_id, owner, name, description, price, is_stream, ipfs_hash, stream_id"
+
+
+# sort name -> (sort column, descending)
+SORT_ORDERS = {
+    "id_asc": ("asset_id", False),
+    "id_desc": ("asset_id", True),
+    "price_asc": ("price", False),
+    "price_desc": ("price", True),
+}
+
+
+def encode_price(price: int) -> str:
+    return str(int(price)).zfill(PRICE_WIDTH)
+
+
+def _encode_cursor(sort: str, row) -> str:
+    position = {"s": sort, "i": row[0]}
+    if SORT_ORDERS[sort][0] == "price":
+        position["p"] = row[4]
+    return base64.urlsafe_b64encode(json.dumps(position, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def _decode_cursor(sort: str, cursor: str) -> Dict[str, Any]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if position["s"] != sort or not isinstance(position["i"], int):
+            raise ValueError
+        if SORT_ORDERS[sort][0] == "price" and not isinstance(position.get("p"), str):
+            raise ValueError
+        return position
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor for this sort order")
+
+
+def _encode_search_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}).encode()).decode().rstrip('=')
+
+
+def _decode_search_cursor(cursor: str) -> int:
+    # Ranked results have no stable sort key to seek on, so search cursors carry an offset
+    try:
+        offset = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))["o"]
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError
+        return offset
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid search cursor")
+
+
+def _row_to_asset(row) -> Tuple[int, AssetRecord]:
+    asset = AssetRecord.from_row(row)
+    return asset.asset_id, asset
+
+
+class CatalogWriter:
+    """Writes that commit together, e.g. an asset row and the transaction that confirmed it."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        # (asset_id, previous owner, new owner), applied to the owner index on commit
+        self.changes: List[Tuple[int, Optional[str], Optional[str]]] = []
+
+    def _owner_of(self, asset_id: int) -> Optional[str]:
+        row = self.conn.execute("SELECT owner FROM assets WHERE asset_id = ?", (asset_id,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, asset_id: int, asset: Dict[str, Any], tx_hash: Optional[str] = None) -> None:
+        previous_owner = self._owner_of(asset_id)
+        self.conn.execute(
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete would skip the FTS triggers
+            f"INSERT INTO assets ({COLUMNS}, tx_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(asset_id) DO UPDATE SET owner = excluded.owner, name = excluded.name, "
+            "description = excluded.description, price = excluded.price, is_stream = excluded.is_stream, "
+            "ipfs_hash = excluded.ipfs_hash, stream_id = excluded.stream_id, tx_hash = excluded.tx_hash, "
+            "updated_at = strftime('%s', 'now')",
+            (
+                asset_id, asset["owner"], asset["name"], asset["description"], encode_price(asset["price"]),
+                int(asset["is_stream"]), asset.get("ipfs_hash"), asset.get("stream_id"), tx_hash
+            )
+        )
+        self.changes.append((asset_id, previous_owner, asset["owner"]))
+
+    def transfer(self, asset_id: int, new_owner: str, tx_hash: Optional[str] = None) -> None:
+        previous_owner = self._owner_of(asset_id)
+        if previous_owner is None:
+            return
+        self.conn.execute(
+            "UPDATE assets SET owner = ?, tx_hash = COALESCE(?, tx_hash), updated_at = strftime('%s', 'now') WHERE asset_id = ?",
+            (new_owner, tx_hash, asset_id)
+        )
+        self.changes.append((asset_id, previous_owner, new_owner))
+
+    def delete(self, asset_id: int) -> None:
+        previous_owner = self._owner_of(asset_id)
+        self.conn.execute("DELETE FROM assets WHERE asset_id = ?", (asset_id,))
+        self.changes.append((asset_id, previous_owner, None))
+
+
+class AssetCatalog:
+    """Persistent listed-asset catalog (SQLite WAL) with a warm in-process read cache."""
+
+    def __init__(self, path: str, cache_size: int = 100000):
+        self.db = SQLiteDatabase(path, SCHEMA)
+        self._cache = TTLCache(maxsize=cache_size, ttl=float('inf'))
+        self._lock = threading.RLock()
+        self._data_version: Dict[int, int] = {}
+        # owner -> asset IDs, loaded per owner on first listing and then maintained on every write
+        self._owner_index: Dict[str, Set[int]] = {}
+        self._search_index_checked = False
+        # Bumped on every committed write, here or (via data_version) in another worker
+        self._version = 0
+
+    def _check_external_writes(self, conn) -> None:
+        # data_version changes when another connection (another worker) commits
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        key = id(conn)
+        if self._data_version.get(key) != version:
+            if key in self._data_version:
+                with self._lock:
+                    self._cache.clear()
+                    self._owner_index.clear()
+                    self._version += 1
+            self._data_version[key] = version
+
+    def _read(self):
+        conn = self.db.connection()
+        self._check_external_writes(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[CatalogWriter]:
+        with self._lock:
+            writer = None
+            try:
+                with self.db.transaction() as conn:
+                    writer = CatalogWriter(conn)
+                    yield writer
+            finally:
+                if writer is not None:
+                    for asset_id, _, _ in writer.changes:
+                        self._cache.pop(asset_id)
+            # Only reached once the transaction has committed
+            self._apply_owner_changes(writer.changes)
+            if writer.changes:
+                self._version += 1
+
+    @property
+    def version(self) -> int:
+        self._read()
+        return self._version
+
+    def _apply_owner_changes(self, changes) -> None:
+        for asset_id, previous_owner, new_owner in changes:
+            if previous_owner in self._owner_index:
+                self._owner_index[previous_owner].discard(asset_id)
+            if new_owner in self._owner_index:
+                self._owner_index[new_owner].add(asset_id)
+
+    def _owned_asset_ids(self, conn, owner: str) -> List[int]:
+        with self._lock:
+            asset_ids = self._owner_index.get(owner)
+            if asset_ids is None:
+                rows = conn.execute("SELECT asset_id FROM assets WHERE owner = ?", (owner,)).fetchall()
+                asset_ids = self._owner_index[owner] = {row[0] for row in rows}
+            return sorted(asset_ids)
+
+    def get(self, asset_id: int) -> Optional[AssetRecord]:
+        return self._get(self._read(), asset_id)
+
+    def _get(self, conn, asset_id: int) -> Optional[AssetRecord]:
+        asset = self._cache.get(asset_id)
+        if asset is None:
+            row = conn.execute(f"SELECT {COLUMNS} FROM assets WHERE asset_id = ?", (asset_id,)).fetchone()
+            if row is None:
+                return None
+            asset = AssetRecord.from_row(row)
+            self._cache.set(asset_id, asset)
+        return asset
+
+    def add(self, asset_id: int, asset: Dict[str, Any], tx_hash: Optional[str] = None) -> None:
+        with self.transaction() as tx:
+            tx.add(asset_id, asset, tx_hash)
+
+    def transfer(self, asset_id: int, new_owner: str, tx_hash: Optional[str] = None) -> None:
+        with self.transaction() as tx:
+            tx.transfer(asset_id, new_owner, tx_hash)
+
+    def delete(self, asset_id: int) -> None:
+        with self.transaction() as tx:
+            tx.delete(asset_id)
+
+    def list_by_owner(self, owner: str) -> List[Tuple[int, AssetRecord]]:
+        # O(assets owned): IDs come from the owner index, records from the read cache
+        conn = self._read()
+        assets = []
+        for asset_id in self._owned_asset_ids(conn, owner):
+            asset = self._get(conn, asset_id)
+            if asset is not None:
+                assets.append((asset_id, asset))
+        return assets
+
+    def items(self) -> List[Tuple[int, AssetRecord]]:
+        rows = self._read().execute(f"SELECT {COLUMNS} FROM assets ORDER BY asset_id").fetchall()
+        return [_row_to_asset(row) for row in rows]
+
+    def page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: str = "id_asc",
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        is_stream: Optional[bool] = None,
+        owner: Optional[str] = None
+    ) -> Tuple[List[Tuple[int, AssetRecord]], Optional[str]]:
+        # Keyset pagination: the cursor holds the last (sort key, asset_id) seen, so every
+        # page is an index range scan and page N costs the same as page 1
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {sort}")
+        column, descending = SORT_ORDERS[sort]
+        where, params = [], []
+        if owner is not None:
+            where.append("owner = ?")
+            params.append(owner)
+        if is_stream is not None:
+            where.append("is_stream = ?")
+            params.append(int(is_stream))
+        if min_price is not None:
+            where.append("price >= ?")
+            params.append(encode_price(min_price))
+        if max_price is not None:
+            where.append("price <= ?")
+            params.append(encode_price(max_price))
+        if cursor:
+            position = _decode_cursor(sort, cursor)
+            op = "<" if descending else ">"
+            if column == "price":
+                where.append(f"(price, asset_id) {op} (?, ?)")
+                params.extend([position["p"], position["i"]])
+            else:
+                where.append(f"asset_id {op} ?")
+                params.append(position["i"])
+
+        direction = "DESC" if descending else "ASC"
+        order_by = f"price {direction}, asset_id {direction}" if column == "price" else f"asset_id {direction}"
+        sql = f"SELECT {COLUMNS} FROM assets"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} LIMIT ?"
+        # Fetch one extra row to know whether there is a next page
+        rows = self._read().execute(sql, (*params, limit + 1)).fetchall()
+
+        next_cursor = _encode_cursor(sort, rows[limit - 1]) if len(rows) > limit else None
+        return [_row_to_asset(row) for row in rows[:limit]], next_cursor
+
+    def _ensure_search_index(self, conn) -> None:
+        # Catalogs created before the search index existed need a one-off rebuild
+        if self._search_index_checked:
+            return
+        assets = conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+        indexed = conn.execute("SELECT COUNT(*) FROM assets_fts_docsize").fetchone()[0]
+        if assets != indexed:
+            logger.info(f"Rebuilding asset search index ({indexed} of {assets} assets indexed)")
+            with self.db.transaction() as tx:
+                tx.execute("INSERT INTO assets_fts(assets_fts) VALUES ('rebuild')")
+        self._search_index_checked = True
+
+    def search(self, query: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[Tuple[int, AssetRecord]], Optional[str], bool]:
+        # Every word must match, as a prefix, in the name or description. The flag is set when
+        # the query matched more than SEARCH_MAX_CANDIDATES assets, so only the newest were ranked
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return [], None, False
+        match = " ".join(f'"{term}"*' for term in terms)
+        offset = _decode_search_cursor(cursor) if cursor else 0
+
+        conn = self._read()
+        self._ensure_search_index(conn)
+        rows = conn.execute(
+            f"SELECT {', '.join('a.' + column for column in COLUMNS.split(', '))} FROM ("
+            f"SELECT rowid, bm25(assets_fts, {SEARCH_WEIGHTS[0]}, {SEARCH_WEIGHTS[1]}) AS score FROM assets_fts "
+            "WHERE assets_fts MATCH ? ORDER BY rowid DESC LIMIT ?"
+            ") hits JOIN assets a ON a.asset_id = hits.rowid ORDER BY hits.score, a.asset_id LIMIT ? OFFSET ?",
+            (match, SEARCH_MAX_CANDIDATES, limit + 1, offset)
+        ).fetchall()
+        # Walking the match list by rowid is cheap, it is scoring that is not
+        truncated = conn.execute(
+            "SELECT 1 FROM assets_fts WHERE assets_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+            (match, SEARCH_MAX_CANDIDATES)
+        ).fetchone() is not None
+
+        next_cursor = _encode_search_cursor(offset + limit) if len(rows) > limit else None
+        return [_row_to_asset(row) for row in rows[:limit]], next_cursor, truncated
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+    def warm(self, limit: int) -> int:
+        # Pre-load the most recently listed assets into the read cache
+        rows = self._read().execute(
+            f"SELECT {COLUMNS} FROM assets ORDER BY asset_id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        for row in rows:
+            asset_id, asset = _row_to_asset(row)
+            self._cache.set(asset_id, asset)
+        return len(rows)
+
+    def __getitem__(self, asset_id: int) -> AssetRecord:
+        asset = self.get(asset_id)
+        if asset is None:
+            raise KeyError(asset_id)
+        return asset
+
+    def __contains__(self, asset_id: int) -> bool:
+        return self.get(asset_id) is not None
+
+    def __len__(self) -> int:
+        return self._read().execute("SELECT COUNT(*) FROM assets").fetchone()[0]
@@ -1,25 +1,37 @@
 import asyncio
 import logging
 import json
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List
 import didkit
 from fastapi import HTTPException
 import os
 import base64
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature, decode_dss_signature
 
-from .key_management import add_private_key, get_private_key, save_keys
+from config import (
+    SUBSCRIPTION_PROOF_TTL, SUBSCRIPTION_PROOF_CACHE_SIZE, SIGNING_KEY_CACHE_SIZE, SIGNING_KEY_CACHE_TTL,
+    DID_RESOLUTION_CACHE_SIZE, DID_RESOLUTION_CACHE_TTL, DID_NEGATIVE_CACHE_TTL
+)
+from .cache import TTLCache
+from .executor import run_in_executor
+from .key_management import add_private_key, get_private_key
+from .metrics import PROOF_DURATION
+from .tracing import stage
 
 logger = logging.getLogger(__name__)
 
+# (did, wallet_address, stream_id) -> signed subscription proof; a new DID for the wallet gets new proofs
+_subscription_proofs = TTLCache(maxsize=SUBSCRIPTION_PROOF_CACHE_SIZE, ttl=SUBSCRIPTION_PROOF_TTL)
+
 class ZKProof:
     def __init__(self):
         self.curve = ec.SECP256K1()
 
-    def generate_proof(self, private_key: str, message: str) -> str:
-        logger.debug(f"Generating proof with private key (first 10 chars): {private_key[:10]}...")
+    def load_signing_key(self, private_key: str) -> ec.EllipticCurvePrivateKey:
+        logger.debug(f"Loading signing key from private key (first 10 chars): {private_key[:10]}...")
         logger.debug(f"Private key length: {len(private_key)}")
 
         try:
@@ -42,8 +54,9 @@ class ZKProof:
         logger.debug(f"Final private key length: {len(private_key_bytes)} bytes")
 
         private_key_int = int.from_bytes(private_key_bytes, 'big')
-        private_key_obj = ec.derive_private_key(private_key_int, self.curve)
-        
+        return ec.derive_private_key(private_key_int, self.curve)
+
+    def sign(self, private_key_obj: ec.EllipticCurvePrivateKey, message: str) -> str:
         signature = private_key_obj.sign(
             message.encode(),
             ec.ECDSA(hashes.SHA256())
@@ -56,6 +69,9 @@ class ZKProof:
             "message": message
         })
 
+    def generate_proof(self, private_key: str, message: str) -> str:
+        return self.sign(self.load_signing_key(private_key), message)
+
     def ed25519_to_secp256k1(self, ed25519_key: bytes) -> bytes:
         # This is a simplification. In practice, you'd need a more robust conversion
         hasher = hashes.Hash(hashes.SHA256())
@@ -81,12 +97,46 @@ class ZKProof:
         except:
             return False
 
+_zkp = ZKProof()
+
+# DID -> ready-to-sign SECP256K1 key. Deriving it (Fernet decrypt + EC scalar
+# multiplication) dominates proof latency, so it is done once per DID per TTL.
+_signing_keys = TTLCache(maxsize=SIGNING_KEY_CACHE_SIZE, ttl=SIGNING_KEY_CACHE_TTL)
+
+def _get_signing_key(did: str) -> ec.EllipticCurvePrivateKey:
+    signing_key = _signing_keys.get(did)
+    if signing_key is None:
+        private_key = get_private_key(did)
+        if not private_key:
+            raise ValueError(f"No private key found for DID: {did}")
+        signing_key = _zkp.load_signing_key(private_key)
+        _signing_keys.set(did, signing_key)
+    return signing_key
+
+def invalidate_signing_key(did: str) -> None:
+    # Only clears this process's cache. With CRYPTO_EXECUTOR=process, signing runs in the
+    # pool's worker processes, and they (like other uvicorn workers) keep their copy until
+    # SIGNING_KEY_CACHE_TTL expires. A did:key is derived from its key, so a cached key can
+    # only go stale if the stored key is replaced or removed out of band.
+    _signing_keys.pop(did)
+
+def set_did_key(did: str, key: str) -> None:
+    add_private_key(did, key)
+    invalidate_signing_key(did)
+
+def get_signing_key_cache_stats() -> Dict[str, int]:
+    return _signing_keys.stats()
+
+def _create_did() -> tuple[str, str]:
+    key = didkit.generate_ed25519_key()
+    did = didkit.key_to_did("key", key)
+    set_did_key(did, key)
+    return did, key
+
 async def create_did() -> tuple[str, str]:
     try:
-        key = didkit.generate_ed25519_key()
-        did = didkit.key_to_did("key", key)
-        add_private_key(did, key)
-        save_keys()  # Save keys after adding a new one
+        with PROOF_DURATION.labels("create_did").time(), stage("create_did"):
+            did, key = await run_in_executor(_create_did)
         logger.info(f"Created new DID: {did}")
         logger.debug(f"Generated key (first 10 chars): {key[:10]}...")
         return did, key
@@ -94,34 +144,96 @@ async def create_did() -> tuple[str, str]:
         logger.error(f"Failed to create DID: {str(e)}")
         raise
 
-async def generate_zkproof(did: str, message: str) -> str:
-    private_key = get_private_key(did)
-    if not private_key:
-        raise ValueError(f"No private key found for DID: {did}")
-    logger.debug(f"Retrieved private key for DID {did} (first 10 chars): {private_key[:10]}...")
-    zkp = ZKProof()
+def _sign_messages(did: str, messages: List[str]) -> List[str]:
+    signing_key = _get_signing_key(did)
+    return [_zkp.sign(signing_key, message) for message in messages]
+
+async def generate_zkproofs(did: str, messages: List[str]) -> List[str]:
+    # All messages are signed in a single executor hop
     try:
-        proof = zkp.generate_proof(private_key, message)
-        logger.debug(f"Generated proof: {proof[:50]}...")  # Log first 50 chars of the proof
-        return proof
+        with PROOF_DURATION.labels("zkproof").time(), stage("zkproof"):
+            proofs = await run_in_executor(_sign_messages, did, list(messages))
+        logger.debug(f"Generated {len(proofs)} proofs for DID {did}")
+        return proofs
     except Exception as e:
         logger.error(f"Error generating proof: {str(e)}")
         raise
 
-async def resolve_did(did: str) -> Dict:
+async def generate_zkproof(did: str, message: str) -> str:
+    proofs = await generate_zkproofs(did, [message])
+    return proofs[0]
+
+async def get_subscription_proofs(did: str, wallet_address: str, stream_ids: List[str]) -> Dict[str, str]:
+    proofs = {}
+    missing = []
+    for stream_id in dict.fromkeys(stream_ids):
+        proof = _subscription_proofs.get((did, wallet_address, stream_id))
+        if proof is None:
+            missing.append(stream_id)
+        else:
+            proofs[stream_id] = proof
+
+    if missing:
+        # One signature covers every stream that has no live proof yet
+        timestamp = int(time.time())
+        message = f"{wallet_address}:{','.join(missing)}:{timestamp}"
+        proof = await generate_zkproof(did, message)
+        for stream_id in missing:
+            _subscription_proofs.set((did, wallet_address, stream_id), proof)
+            proofs[stream_id] = proof
+        logger.debug(f"Signed subscription proof for {len(missing)} stream(s) of wallet {wallet_address}")
+
+    return proofs
+
+def invalidate_subscription_proofs(did: str, wallet_address: str, stream_ids: List[str]) -> None:
+    for stream_id in stream_ids:
+        _subscription_proofs.pop((did, wallet_address, stream_id))
+
+def get_subscription_proof_cache_stats() -> Dict[str, int]:
+    return _subscription_proofs.stats()
+
+# DID -> resolved DID document (treat as read-only), or _DID_NOT_FOUND
+_resolved_dids = TTLCache(maxsize=DID_RESOLUTION_CACHE_SIZE, ttl=DID_RESOLUTION_CACHE_TTL)
+_pending_resolutions: Dict[str, asyncio.Future] = {}
+_DID_NOT_FOUND = object()
+
+async def _resolve_uncached(did: str):
     try:
-        did_document = didkit.resolve_did(did, "{}")
-        return json.loads(did_document)
+        # didkit returns a future bound to the running loop, so it is awaited here rather than in the executor
+        with PROOF_DURATION.labels("resolve_did").time(), stage("resolve_did"):
+            did_document = json.loads(await didkit.resolve_did(did, "{}"))
     except didkit.DIDKitException as e:
         logger.error(f"Error resolving DID: {str(e)}")
         if "notFound" in str(e):
-            raise HTTPException(status_code=404, detail="DID not found")
-        else:
-            raise HTTPException(status_code=500, detail="Error resolving DID")
+            _resolved_dids.set(did, _DID_NOT_FOUND, ttl=DID_NEGATIVE_CACHE_TTL)
+            return _DID_NOT_FOUND
+        raise HTTPException(status_code=500, detail="Error resolving DID")
     except Exception as e:
         logger.error(f"Unexpected error resolving DID: {str(e)}")
         raise HTTPException(status_code=500, detail="Unexpected error resolving DID")
 
+    # did:key documents are derived from the key itself and never change
+    ttl = float('inf') if did.startswith("did:key:") else None
+    _resolved_dids.set(did, did_document, ttl=ttl)
+    return did_document
+
+async def resolve_did(did: str) -> Dict:
+    did_document = _resolved_dids.get(did)
+    if did_document is None:
+        # Concurrent lookups of the same DID share one resolution
+        pending = _pending_resolutions.get(did)
+        if pending is None:
+            pending = asyncio.ensure_future(_resolve_uncached(did))
+            _pending_resolutions[did] = pending
+            pending.add_done_callback(lambda _: _pending_resolutions.pop(did, None))
+        did_document = await asyncio.shield(pending)
+    if did_document is _DID_NOT_FOUND:
+        raise HTTPException(status_code=404, detail="DID not found")
+    return did_document
+
+def get_did_resolution_cache_stats() -> Dict[str, int]:
+    return _resolved_dids.stats()
+
 async def verify_did(did: str, verification_method: str) -> bool:
     try:
         did_document = await resolve_did(did)
@@ -130,16 +242,29 @@ async def verify_did(did: str, verification_method: str) -> bool:
         logger.error(f"Error verifying DID: {str(e)}")
         return False
 
+async def verify_dids(items: List[tuple[str, str]]) -> List[bool]:
+    # Each distinct DID is resolved once, all of them concurrently
+    dids = list(dict.fromkeys(did for did, _ in items))
+    results = await asyncio.gather(*(resolve_did(did) for did in dids), return_exceptions=True)
+    methods = {}
+    for did, result in zip(dids, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Error verifying DID {did}: {str(result)}")
+            methods[did] = set()
+        else:
+            methods[did] = {vm['id'] for vm in result.get('verificationMethod', [])}
+    return [verification_method in methods[did] for did, verification_method in items]
+
 async def issue_credential(did: str, key: str, credential: Dict[str, Any]) -> str:
     try:
-        verification_method = didkit.key_to_verification_method("key", key)
+        verification_method = await didkit.key_to_verification_method("key", key)
         
         options = {
             "proofPurpose": "assertionMethod",
             "verificationMethod": verification_method
         }
         
-        signed_credential = didkit.issue_credential(
+        signed_credential = await didkit.issue_credential(
             json.dumps(credential),
             json.dumps(options),
             key
@@ -152,7 +277,19 @@ async def issue_credential(did: str, key: str, credential: Dict[str, Any]) -> st
 
 async def verify_credential(credential: str) -> bool:
     try:
-        result = didkit.verify_credential(credential, "{}")
-        return json.loads(result).get("verified", False)
+        with PROOF_DURATION.labels("verify_credential").time(), stage("verify_credential"):
+            result = json.loads(await didkit.verify_credential(credential, "{}"))
+        return not result.get("errors")
     except didkit.DIDKitException as e:
-        raise ValueError(f"Error verifying credential: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Error verifying credential: {str(e)}")
+
+async def verify_credentials(credentials: List[str]) -> List[bool]:
+    results = await asyncio.gather(*(verify_credential(credential) for credential in credentials), return_exceptions=True)
+    verified = []
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error(f"Error verifying credential: {str(result)}")
+            verified.append(False)
+        else:
+            verified.append(result)
+    return verified
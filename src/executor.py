@@ -0,0 +1,50 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from config import CRYPTO_EXECUTOR, CRYPTO_EXECUTOR_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def executor_workers() -> int:
+    return CRYPTO_EXECUTOR_WORKERS or os.cpu_count() or 1
+
+
+def get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = executor_workers()
+                if CRYPTO_EXECUTOR == 'process':
+                    # Functions sent here must be module-level; each worker process keeps
+                    # its own key caches and reads keys from the shared key store
+                    _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+                elif CRYPTO_EXECUTOR == 'thread':
+                    _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='crypto')
+                else:
+                    raise ValueError(f"Unknown CRYPTO_EXECUTOR: {CRYPTO_EXECUTOR}")
+                logger.info(f"Started {CRYPTO_EXECUTOR} executor with {workers} workers for CPU-bound work")
+    return _executor
+
+
+async def run_in_executor(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,175 @@
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException
+from web3 import Web3
+
+from config import STORE_SERVICE_URL, STREAM_SERVICE_URL, TRANSACT_SERVICE_URL
+from . import rpc_audit, tracing
+from .responses import FastJSONRoute
+from .metrics import (
+    HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, RPC_DURATION, RPC_ERRORS, RPC_MEMOIZED, RPC_REQUESTS,
+    UPSTREAM_DURATION, UPSTREAM_REQUESTS,
+)
+
+# FastAPI, web3 and aiohttp hooks feeding src.metrics; kept out of src.metrics so that
+# modules which only record metrics (and executor workers) do not import web3 and aiohttp
+
+
+class InstrumentedRoute(FastJSONRoute):
+    """APIRoute that records latency and in-flight requests, and traces stages, per route template."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        # Route templates, not raw paths, keep label cardinality bounded
+        route = self.path
+
+        async def instrumented_handler(request):
+            method = request.method
+            in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method, route)
+            in_flight.inc()
+            trace, token = tracing.start_trace(method, route, request.headers.get("x-request-id"))
+            audit, audit_token = rpc_audit.start_audit(f"{method} {route}")
+            status = 500
+            start = time.perf_counter()
+            response = error = None
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                error = e
+                raise
+            except RequestValidationError:
+                # Turned into a 422 by FastAPI's exception handler, after this route returns
+                status = 422
+                raise
+            finally:
+                HTTP_REQUEST_DURATION.labels(method, route, str(status)).observe(time.perf_counter() - start)
+                in_flight.dec()
+                rpc_audit.finish_audit(audit, audit_token)
+                server_timing = tracing.finish_trace(trace, token, status)
+                if server_timing is not None:
+                    if response is not None:
+                        response.headers["Server-Timing"] = server_timing
+                    elif error is not None:
+                        error.headers = {**(error.headers or {}), "Server-Timing": server_timing}
+
+        return instrumented_handler
+
+
+class InstrumentedHTTPProvider(Web3.HTTPProvider):
+    """HTTPProvider that counts and times every JSON-RPC call by method, and audits calls per request."""
+
+    def make_request(self, method, params):
+        audit = rpc_audit.current()
+        if audit is not None:
+            key, cached = audit.record(method, params)
+            if cached is not None:
+                RPC_MEMOIZED.labels(method).inc()
+                return cached
+        start = time.perf_counter()
+        try:
+            response = super().make_request(method, params)
+            if audit is not None:
+                audit.remember(key, response)
+            return response
+        except Exception:
+            RPC_ERRORS.labels(method).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            RPC_REQUESTS.labels(method).inc()
+            RPC_DURATION.labels(method).observe(elapsed)
+            tracing.record(f"rpc.{method}", elapsed)
+
+    def open_connection(self, timeout: float) -> None:
+        # web3 keeps one requests.Session per thread; this opens the calling thread's pooled
+        # connection with a request timeout of its own, whatever request_kwargs say
+        kwargs = dict(self.get_request_kwargs(), timeout=timeout)
+        self._request_session_manager.make_post_request(
+            self.endpoint_uri, self.encode_rpc_request("net_version", []), **kwargs
+        )
+
+
+_UPSTREAMS = [
+    (url.rstrip("/"), name)
+    for url, name in ((STORE_SERVICE_URL, "store"), (STREAM_SERVICE_URL, "stream"), (TRANSACT_SERVICE_URL, "transact"))
+    if url
+]
+
+
+def _upstream_labels(url) -> Tuple[str, str]:
+    url = str(url)
+    for base, name in _UPSTREAMS:
+        if url.startswith(base):
+            path = url[len(base):]
+            break
+    else:
+        name, path = "other", urlsplit(url).path
+    # Only the first path segment: /subscribe/<stream_id> must not become a label per stream
+    return name, "/" + path.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+
+
+async def _on_request_start(session, context, params) -> None:
+    context.start = time.perf_counter()
+
+
+def _record_upstream(context, url, status: str) -> None:
+    elapsed = time.perf_counter() - context.start
+    service, route = _upstream_labels(url)
+    UPSTREAM_REQUESTS.labels(service, route, status).inc()
+    UPSTREAM_DURATION.labels(service, route).observe(elapsed)
+    tracing.record(f"{service}.{route.strip('/') or 'root'}", elapsed)
+
+
+async def _on_request_end(session, context, params) -> None:
+    _record_upstream(context, params.url, str(params.response.status))
+
+
+async def _on_request_exception(session, context, params) -> None:
+    _record_upstream(context, params.url, "error")
+
+
+_trace_config = aiohttp.TraceConfig()
+_trace_config.on_request_start.append(_on_request_start)
+_trace_config.on_request_end.append(_on_request_end)
+_trace_config.on_request_exception.append(_on_request_exception)
+
+
+def client_session(**kwargs) -> aiohttp.ClientSession:
+    # aiohttp session whose requests are counted and timed per upstream service and route
+    return aiohttp.ClientSession(trace_configs=[_trace_config], **kwargs)
+
+
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+
+def open_shared_session(pool_size: int) -> aiohttp.ClientSession:
+    # One keep-alive connection pool for all store/stream/transact calls; opened at start-up
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = client_session(connector=aiohttp.TCPConnector(limit=pool_size))
+    return _shared_session
+
+
+async def close_shared_session() -> None:
+    global _shared_session
+    if _shared_session is not None:
+        await _shared_session.close()
+        _shared_session = None
+
+
+@asynccontextmanager
+async def upstream_session() -> AsyncIterator[aiohttp.ClientSession]:
+    # The shared pool once start-up has opened it, otherwise a one-off session
+    if _shared_session is not None and not _shared_session.closed:
+        yield _shared_session
+    else:
+        async with client_session() as session:
+            yield session
@@ -1,15 +1,35 @@
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import asyncio
 import base64
+import fcntl
+import hashlib
+import hmac
 import os
 import json
 import logging
+import stat
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from config import KEY_MASTER_PASSWORD, KEY_FILE, KEY_STORE_PATH, DERIVED_KEY, DERIVED_KEY_HANDOFF_PATH
+from .key_store import SQLiteKeyStore
 
 logger = logging.getLogger(__name__)
 
 class KeyManager:
-    def __init__(self, master_password):
+    def __init__(self, master_password, derived_key=None, handoff_path=None, store=None):
+        self._master_password = master_password
+        self.store = store
+        self._derived_key = derived_key
+        self._handoff_path = handoff_path
+        self._fernet: Optional[Fernet] = None
+        self._lock = threading.Lock()
+        self.keys = {}
+
+    def derive_key(self) -> bytes:
         salt = b'salt_'  # In production, use a secure random salt and store it
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
@@ -17,19 +37,123 @@ class KeyManager:
             salt=salt,
             iterations=100000,
         )
-        key = base64.urlsafe_b64encode(kdf.derive(master_password.encode()))
-        self.fernet = Fernet(key)
-        self.keys = {}
+        return base64.urlsafe_b64encode(kdf.derive(self._master_password.encode()))
+
+    @property
+    def fernet(self) -> Fernet:
+        if self._fernet is None:
+            with self._lock:
+                if self._fernet is None:
+                    self._fernet = Fernet(self._load_or_derive_key())
+        return self._fernet
+
+    def _load_or_derive_key(self) -> bytes:
+        # A key injected by the deployment (e.g. a mounted secret) skips PBKDF2 entirely
+        if self._derived_key:
+            logger.info("Using pre-derived master key from environment")
+            return self._derived_key.encode()
+
+        key = self._read_handoff()
+        if key:
+            logger.info(f"Using master key handed off via {self._handoff_path}")
+            return key
+
+        # Workers starting together queue here; the first derives, the rest read its handoff
+        with self._handoff_lock():
+            key = self._read_handoff()
+            if key:
+                logger.info(f"Using master key handed off via {self._handoff_path}")
+                return key
+            logger.info("Deriving master key")
+            key = self.derive_key()
+            self._write_handoff(key)
+        return key
+
+    @contextmanager
+    def _handoff_lock(self) -> Iterator[None]:
+        if not self._handoff_path:
+            yield
+            return
+        try:
+            fd = os.open(f"{self._handoff_path}.lock", os.O_RDWR | os.O_CREAT | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+        except OSError as e:
+            logger.warning(f"Cannot open master key handoff lock, deriving without it: {str(e)}")
+            yield
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _fingerprint(self, key: bytes) -> bytes:
+        # Ties a handed-off key to the master password it was derived from
+        return hmac.new(key, self._master_password.encode(), hashlib.sha256).hexdigest().encode()
+
+    def _read_handoff(self) -> Optional[bytes]:
+        if not self._handoff_path:
+            return None
+        try:
+            fd = os.open(self._handoff_path, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Cannot open master key handoff file: {str(e)}")
+            return None
+        with os.fdopen(fd, 'rb') as f:
+            st = os.fstat(f.fileno())
+            # Only trust a file we own that nobody else can read or write
+            if st.st_uid != os.getuid() or st.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                logger.warning(f"Ignoring master key handoff file with unsafe ownership or permissions: {self._handoff_path}")
+                return None
+            key, _, fingerprint = f.read().strip().partition(b'\n')
+        try:
+            Fernet(key)
+        except ValueError:
+            logger.warning(f"Ignoring malformed master key handoff file: {self._handoff_path}")
+            return None
+        if not hmac.compare_digest(fingerprint.strip(), self._fingerprint(key)):
+            logger.warning(f"Ignoring master key handoff file written for a different master password: {self._handoff_path}")
+            return None
+        return key
+
+    def _write_handoff(self, key: bytes) -> None:
+        if not self._handoff_path:
+            return
+        tmp_path = f"{self._handoff_path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(key + b'\n' + self._fingerprint(key))
+            os.replace(tmp_path, self._handoff_path)
+        except OSError as e:
+            logger.warning(f"Could not write master key handoff file: {str(e)}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def initialize(self, filename=None):
+        _ = self.fernet
+        if filename:
+            self.load_from_file(filename)
 
     def add_key(self, did, private_key):
         logger.debug(f"Adding key for DID: {did}")
         logger.debug(f"Key to be added (first 10 chars): {private_key[:10]}...")
         encrypted_key = self.fernet.encrypt(private_key.encode()).decode()
+        if self.store is not None:
+            self.store.put(did, encrypted_key)
         self.keys[did] = encrypted_key
 
     def get_key(self, did):
         logger.debug(f"Retrieving key for DID: {did}")
         encrypted_key = self.keys.get(did)
+        if encrypted_key is None and self.store is not None:
+            # Keys are loaded on demand, another worker may have created this one
+            encrypted_key = self.store.get(did)
+            if encrypted_key:
+                self.keys[did] = encrypted_key
         if encrypted_key:
             decrypted_key = self.fernet.decrypt(encrypted_key.encode()).decode()
             logger.debug(f"Retrieved key (first 10 chars): {decrypted_key[:10]}...")
@@ -39,33 +163,57 @@ class KeyManager:
 
     def save_to_file(self, filename):
         logger.info(f"Saving keys to file: {filename}")
+        keys = dict(self.store.items()) if self.store is not None else self.keys
         with open(filename, 'w') as f:
-            json.dump(self.keys, f)
+            json.dump(keys, f)
 
     def load_from_file(self, filename):
         logger.info(f"Loading keys from file: {filename}")
-        if os.path.exists(filename):
+        if self.store is not None:
+            self.store.import_json(filename)
+        elif os.path.exists(filename):
             with open(filename, 'r') as f:
                 self.keys = json.load(f)
             logger.debug(f"Loaded {len(self.keys)} keys")
         else:
             logger.warning(f"Key file not found: {filename}")
 
-# Initialize the KeyManager (in a real-world scenario, you'd use a secure way to input the master password)
-key_manager = KeyManager("master_password")
+# Key material is derived on first use or by init_key_manager() during app startup,
+# never at import time (in a real-world scenario, use a secure way to input the master password)
+key_manager = KeyManager(
+    KEY_MASTER_PASSWORD,
+    derived_key=DERIVED_KEY,
+    handoff_path=DERIVED_KEY_HANDOFF_PATH,
+    store=SQLiteKeyStore(KEY_STORE_PATH)
+)
+_keys_loaded = False
+_keys_lock = threading.Lock()
+
+def _ensure_keys_loaded():
+    global _keys_loaded
+    if not _keys_loaded:
+        with _keys_lock:
+            if not _keys_loaded:
+                key_manager.initialize(KEY_FILE)
+                _keys_loaded = True
 
 def get_private_key(did):
+    _ensure_keys_loaded()
     return key_manager.get_key(did)
 
 def add_private_key(did, private_key):
+    _ensure_keys_loaded()
     key_manager.add_key(did, private_key)
 
-# Save keys to file (call this when adding or updating keys)
-def save_keys():
-    key_manager.save_to_file('keys.json')
+# Keys are persisted one row at a time by add_private_key; this only exports a JSON snapshot
+def save_keys(filename=KEY_FILE):
+    key_manager.save_to_file(filename)
 
-# Load keys from file (call this when initializing the application)
+# Load keys (and migrate a legacy keys.json into the store) when initializing the application
 def load_keys():
-    key_manager.load_from_file('keys.json')
+    _ensure_keys_loaded()
 
-load_keys()
\ No newline at end of file
+async def init_key_manager():
+    # PBKDF2 is CPU bound, keep it off the event loop
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _ensure_keys_loaded)
@@ -0,0 +1,62 @@
+import json
+import logging
+import os
+from typing import Optional
+
+from .db import SQLiteDatabase
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS did_keys (
+    did TEXT PRIMARY KEY,
+    encrypted_key TEXT NOT NULL,
+    created_at INTEGER NOT NULL DEFAULT (strftime('%s', 'now'))
+);
+"""
+
+
+class SQLiteKeyStore:
+    """Encrypted DID keys, one row per key, shared by every worker using the same file."""
+
+    def __init__(self, path: str):
+        self.db = SQLiteDatabase(path, SCHEMA)
+
+    def put(self, did: str, encrypted_key: str) -> None:
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO did_keys (did, encrypted_key) VALUES (?, ?)",
+                (did, encrypted_key)
+            )
+
+    def get(self, did: str) -> Optional[str]:
+        row = self.db.connection().execute(
+            "SELECT encrypted_key FROM did_keys WHERE did = ?", (did,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, did: str) -> None:
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM did_keys WHERE did = ?", (did,))
+
+    def items(self):
+        return self.db.connection().execute("SELECT did, encrypted_key FROM did_keys").fetchall()
+
+    def __len__(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM did_keys").fetchone()[0]
+
+    def import_json(self, filename: str) -> int:
+        # One-off migration from the legacy keys.json file; existing rows win
+        if not os.path.exists(filename):
+            return 0
+        with open(filename, 'r') as f:
+            keys = json.load(f)
+        with self.db.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO did_keys (did, encrypted_key) VALUES (?, ?)",
+                keys.items()
+            )
+            imported = conn.total_changes - before
+        logger.info(f"Imported {imported} of {len(keys)} keys from {filename}")
+        return imported
@@ -0,0 +1,152 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from config import LOG_FORMAT, LOG_LEVEL, LOG_QUEUE_SIZE, LOG_SAMPLING
+from . import tracing
+
+# Arguments of these types cannot change after the call, so formatting them can wait
+# for the listener thread; anything else is formatted by the caller
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    # 'src.marketplace=0.1,main=0.5' -> {'src.marketplace': 0.1, 'main': 0.5}
+    rates = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = part.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of sub-WARNING records per logger, matched by the longest name prefix."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate, matched = 1.0, -1
+            for prefix, prefix_rate in self.rates.items():
+                if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > matched:
+                    rate, matched = prefix_rate, len(prefix)
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full and defers formatting to the listener."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Other handlers (e.g. pytest's caplog) still see the original record
+        record = copy.copy(record)
+        # A single mapping argument is stored as record.args itself, not in a tuple
+        if record.args and not (isinstance(record.args, tuple) and all(isinstance(arg, _IMMUTABLE_ARGS) for arg in record.args)):
+            record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            # Tracebacks hold frames; render them while they are still accurate
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        trace = tracing.current()
+        if trace is not None:
+            record.request_id = trace.request_id
+            record.route = trace.route
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line; `extra=` fields and the request id/route are included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, separators=(',', ':'))
+
+
+class _DrainingListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than failing on a full queue at shutdown
+        self.queue.put(self._sentinel)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(handler: Optional[logging.Handler] = None) -> logging.Handler:
+    """Route the root logger through a background thread; safe to call more than once."""
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _queue_handler is not None:
+            return _queue_handler
+        if handler is None:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(JSONFormatter() if LOG_FORMAT == "json" else
+                                 logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+        log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        rates = parse_sampling(LOG_SAMPLING)
+        if rates:
+            queue_handler.addFilter(SamplingFilter(rates))
+        root = logging.getLogger()
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(queue_handler)
+        _listener = _DrainingListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        _queue_handler = queue_handler
+        atexit.register(shutdown_logging)
+        return queue_handler
+
+
+def shutdown_logging() -> None:
+    # Drains what is already queued, then stops the listener thread
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            logging.getLogger().removeHandler(_queue_handler)
+            _listener.stop()
+            _listener = _queue_handler = None
+
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
@@ -1,12 +1,24 @@
 import logging
 import binascii
+from typing import Optional
 from web3.exceptions import ContractLogicError
 from web3 import Web3
+from .instrumentation import InstrumentedHTTPProvider
+from .tracing import stage
 from config import get_web3_url, PRODUCER_PRIVATE_KEY, CONSUMER_PRIVATE_KEY, CONSUMER_WALLET_ADDRESS, PRODUCER_WALLET_ADDRESS
 
 logger = logging.getLogger(__name__)
 
-web3 = Web3(Web3.HTTPProvider(get_web3_url()))
+web3 = Web3(InstrumentedHTTPProvider(get_web3_url()))
+
+_chain_id: Optional[int] = None
+
+def get_chain_id() -> int:
+    # Fixed for a given node, so resolved once (by the start-up warm-up) rather than per transaction
+    global _chain_id
+    if _chain_id is None:
+        _chain_id = web3.eth.chain_id
+    return _chain_id
 
 def get_private_key(wallet_address):
     if wallet_address.lower() == PRODUCER_WALLET_ADDRESS.lower():
@@ -26,7 +38,7 @@ def add_data_asset(contract, ipfs_hash: str, price: int, wallet_address: str):
         
         # Build the transaction
         txn = contract.functions.addDataAsset(ipfs_hash, price).build_transaction({
-            'chainId': web3.eth.chain_id,
+            'chainId': get_chain_id(),
             'gas': 2000000,
             'gasPrice': web3.eth.gas_price,
             'nonce': nonce,
@@ -34,30 +46,32 @@ def add_data_asset(contract, ipfs_hash: str, price: int, wallet_address: str):
         })
         
         # Sign the transaction
-        signed_txn = web3.eth.account.sign_transaction(txn, private_key=PRODUCER_PRIVATE_KEY)
+        with stage("sign_tx"):
+            signed_txn = web3.eth.account.sign_transaction(txn, private_key=PRODUCER_PRIVATE_KEY)
         
         # Send the transaction
         tx_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
         
         # Wait for the transaction receipt
-        tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        with stage("wait_receipt"):
+            tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
         
         if tx_receipt['status'] == 0:
             raise Exception("Transaction failed")
         
         logger.info(f"Transaction hash: {tx_hash.hex()}")
-        logger.info(f"Transaction receipt: {tx_receipt}")
+        logger.debug("Transaction receipt: %s", tx_receipt)
         
         # Get the asset ID from the event logs
         logs = contract.events.DataAssetAdded().process_receipt(tx_receipt)
-        logger.debug(f"Logs from process_receipt: {logs}")
+        logger.debug("Logs from process_receipt: %s", logs)
         if logs:
             asset_id = logs[0]['args']['assetId']
             logger.info(f"Asset added to blockchain. Asset ID: {asset_id}, Owner: {checksum_address}")
             return asset_id, tx_hash.hex()
         else:
             logger.error("Failed to get asset ID from event logs")
-            logger.debug(f"Transaction receipt: {tx_receipt}")
+            logger.debug("Transaction receipt: %s", tx_receipt)
             raise Exception("Failed to get asset ID from event logs")
     except Exception as e:
         logger.error(f"Error adding asset to blockchain: {str(e)}")
@@ -73,7 +87,7 @@ def purchase_data_asset(contract, asset_id: int, wallet_address: str, price: int
         
         # Build the transaction
         txn = contract.functions.purchaseDataAsset(asset_id, proof).build_transaction({
-            'chainId': web3.eth.chain_id,
+            'chainId': get_chain_id(),
             'gas': 2000000,
             'gasPrice': web3.eth.gas_price,
             'nonce': nonce,
@@ -84,19 +98,21 @@ def purchase_data_asset(contract, asset_id: int, wallet_address: str, price: int
 
         
         # Sign the transaction
-        signed_txn = web3.eth.account.sign_transaction(txn, private_key=CONSUMER_PRIVATE_KEY)
+        with stage("sign_tx"):
+            signed_txn = web3.eth.account.sign_transaction(txn, private_key=CONSUMER_PRIVATE_KEY)
         
         # Send the transaction
         tx_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
         
         # Wait for the transaction receipt
-        tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        with stage("wait_receipt"):
+            tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
 
         if tx_receipt['status'] == 0:
             raise Exception("Transaction failed")
         
         logger.info(f"Transaction hash: {tx_hash.hex()}")
-        logger.info(f"Transaction receipt: {tx_receipt}")
+        logger.debug("Transaction receipt: %s", tx_receipt)
         
         if tx_receipt['status'] == 0:
             raise Exception("Transaction failed")
@@ -127,16 +143,18 @@ def withdraw_revenue(contract, wallet_address: str):
         nonce = web3.eth.get_transaction_count(checksum_address)
         
         txn = contract.functions.withdrawRevenue().build_transaction({
-            'chainId': web3.eth.chain_id,
+            'chainId': get_chain_id(),
             'gas': 2000000,
             'gasPrice': web3.eth.gas_price,
             'nonce': nonce,
             'from': checksum_address
         })
         
-        signed_txn = web3.eth.account.sign_transaction(txn, private_key=private_key)
+        with stage("sign_tx"):
+            signed_txn = web3.eth.account.sign_transaction(txn, private_key=private_key)
         tx_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        with stage("wait_receipt"):
+            tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
         
         if tx_receipt['status'] == 0:
             raise Exception("Transaction failed")
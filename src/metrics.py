@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers sub-millisecond cache hits up to slow chain confirmations
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Value:
+    __slots__ = ("value", "function", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+        self._lock = lock
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        # Read at scrape time only, for values that already live elsewhere (cache stats)
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...], lock: threading.Lock):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional["Registry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> List[str]:
+        try:
+            value = child.get()
+        except Exception as e:
+            logger.debug(f"Skipping {self.name}{values}: {str(e)}")
+            return []
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value(self._lock)
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value(self._lock)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.labels().set_function(function)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional["Registry"] = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets, self._lock)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_child(self, values, child) -> List[str]:
+        with self._lock:
+            counts, total = list(child.counts), child.sum
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> bytes:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return ("\n".join(lines) + "\n").encode()
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "core_http_requests_in_flight", "Requests currently being handled", ["method", "route"])
+HTTP_REQUEST_DURATION = Histogram(
+    "core_http_request_duration_seconds", "Request latency by route and status", ["method", "route", "status"])
+RPC_REQUESTS = Counter(
+    "core_web3_rpc_requests_total", "JSON-RPC calls to the chain node by method", ["method"])
+RPC_ERRORS = Counter(
+    "core_web3_rpc_errors_total", "JSON-RPC calls that raised, by method", ["method"])
+RPC_DURATION = Histogram(
+    "core_web3_rpc_duration_seconds", "JSON-RPC call latency by method", ["method"])
+RPC_MEMOIZED = Counter(
+    "core_web3_rpc_memoized_total", "Repeated read-only JSON-RPC calls answered within the request", ["method"])
+UPSTREAM_REQUESTS = Counter(
+    "core_upstream_requests_total", "Calls to the store/stream/transact services", ["service", "route", "status"])
+UPSTREAM_DURATION = Histogram(
+    "core_upstream_request_duration_seconds", "Store/stream/transact call latency", ["service", "route"])
+PROOF_DURATION = Histogram(
+    "core_proof_duration_seconds", "DID and proof operations, including executor queueing", ["operation"])
+WALLET_SESSIONS = Gauge("core_wallet_sessions", "Live authenticated wallet sessions")
+CACHE_ENTRIES = Gauge("core_cache_entries", "Entries held per in-process cache", ["cache"])
+CACHE_HITS = Counter("core_cache_hits_total", "Cache hits per in-process cache", ["cache"])
+CACHE_MISSES = Counter("core_cache_misses_total", "Cache misses per in-process cache", ["cache"])
+CACHE_EVICTIONS = Counter("core_cache_evictions_total", "Capacity evictions per in-process cache", ["cache"])
+LOG_RECORDS_DROPPED = Counter("core_log_records_dropped_total", "Log records dropped because the log queue was full")
+
+
+def register_cache(name: str, stats: Callable[[], Dict[str, int]]) -> None:
+    CACHE_ENTRIES.labels(name).set_function(lambda: stats()["size"])
+    CACHE_HITS.labels(name).set_function(lambda: stats()["hits"])
+    CACHE_MISSES.labels(name).set_function(lambda: stats()["misses"])
+    CACHE_EVICTIONS.labels(name).set_function(lambda: stats()["evictions"])
+
+
+def render() -> bytes:
+    return REGISTRY.render()
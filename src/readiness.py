@@ -0,0 +1,51 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_INTERVAL = 30.0
+
+
+class Readiness:
+    """Named warm-up steps run at start-up; the service is ready once all of them have passed."""
+
+    def __init__(self, retry_interval: float = 2.0):
+        self.retry_interval = retry_interval
+        self.checks: Dict[str, Dict[str, Any]] = {}
+        self._steps: List[Tuple[str, Callable[[], Awaitable[Any]]]] = []
+
+    def add(self, name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        self._steps.append((name, step))
+        self.checks[name] = {"status": "pending"}
+
+    @property
+    def ready(self) -> bool:
+        return all(check["status"] == "ok" for check in self.checks.values())
+
+    async def run(self) -> None:
+        # Steps are independent and run concurrently; each one retries, with backoff, until it succeeds
+        start = time.perf_counter()
+        await asyncio.gather(*(self._run_step(name, step) for name, step in self._steps))
+        logger.info(f"Warm-up finished in {(time.perf_counter() - start) * 1000:.0f} ms, ready")
+
+    async def _run_step(self, name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        attempts = 0
+        while True:
+            attempts += 1
+            start = time.perf_counter()
+            try:
+                detail = await step()
+            except Exception as e:
+                self.checks[name] = {"status": "failed", "attempts": attempts, "error": str(e)}
+                logger.warning(f"Warm-up step {name} failed (attempt {attempts}), retrying: {str(e)}")
+                await asyncio.sleep(min(self.retry_interval * 2 ** (attempts - 1), MAX_RETRY_INTERVAL))
+                continue
+            self.checks[name] = {"status": "ok", "ms": round((time.perf_counter() - start) * 1000, 1)}
+            if detail is not None:
+                self.checks[name]["detail"] = detail
+            return
+
+    def report(self) -> Dict[str, Any]:
+        return {"status": "ready" if self.ready else "warming", "checks": self.checks}
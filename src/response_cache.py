@@ -0,0 +1,41 @@
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fastapi.responses import Response
+
+from .cache import TTLCache
+from .responses import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Serialized JSON responses keyed by endpoint/params, valid for one catalog version."""
+
+    def __init__(self, maxsize: int):
+        # No TTL: entries go stale only when the version moves on, and are then replaced or evicted
+        self._cache = TTLCache(maxsize=maxsize, ttl=float('inf'))
+
+    def get(self, key: Hashable, version: int) -> Optional[bytes]:
+        entry = self._cache.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, version: int, body: bytes) -> None:
+        self._cache.set(key, (version, body))
+
+    def respond(self, key: Hashable, version: int, build: Callable[[], Any]) -> Response:
+        # The version must be read before building, so a write that lands mid-build leaves
+        # this entry under the old version rather than serving stale data as current
+        body = self.get(key, version)
+        if body is None:
+            body = dumps(build())
+            self.set(key, version, body)
+        return Response(content=body, media_type="application/json")
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
@@ -0,0 +1,118 @@
+import functools
+import inspect
+import json
+import logging
+from collections.abc import Mapping
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Integers outside this range (e.g. uint256 wei amounts) are sent as decimal strings,
+# which is also where orjson stops encoding them natively
+INT_MIN = -2**63
+INT_MAX = 2**64 - 1
+
+if orjson is None:
+    logger.info("orjson is not installed; JSON responses fall back to the stdlib encoder")
+
+
+def _default(value: Any) -> Any:
+    # HexBytes is a bytes subclass
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if isinstance(value, Mapping):
+        # web3 receipts and events are AttributeDicts
+        return dict(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stringify_large_ints(value: Any) -> Any:
+    if type(value) is int:
+        return value if INT_MIN <= value <= INT_MAX else str(value)
+    if isinstance(value, Mapping):
+        return {key: _stringify_large_ints(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_stringify_large_ints(item) for item in value]
+    return value
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Almost always an integer beyond 64 bits; only then pay for a full walk
+            return orjson.dumps(_stringify_large_ints(content), default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        _stringify_large_ints(content), default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson when available, aware of web3 types."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _encode_directly(endpoint: Callable[..., Any], response_class: type, status_code: Any) -> Callable[..., Any]:
+    # The endpoint's return value becomes the response as is. FastAPI would otherwise run it
+    # through jsonable_encoder, which utf-8 decodes bytes (HexBytes included) and walks every
+    # value a second time. Status and headers set on an injected Response still apply.
+    signature = inspect.signature(endpoint)
+    parameters = list(signature.parameters.values())
+    # FastAPI injects a single Response per endpoint: reuse the endpoint's own if it takes one
+    response_param = next((param.name for param in parameters if isinstance(param.annotation, type)
+                           and issubclass(param.annotation, Response)), None)
+    if response_param is None:
+        parameters.append(inspect.Parameter("_sub_response", inspect.Parameter.KEYWORD_ONLY, annotation=Response))
+    is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+    @functools.wraps(endpoint)
+    async def encode_directly(**kwargs: Any) -> Any:
+        sub_response = kwargs[response_param] if response_param else kwargs.pop("_sub_response")
+        if is_coroutine:
+            content = await endpoint(**kwargs)
+        else:
+            content = await run_in_threadpool(functools.partial(endpoint, **kwargs))
+        if isinstance(content, Response):
+            return content
+        response = response_class(content, status_code=status_code or sub_response.status_code or 200)
+        if not is_body_allowed_for_status_code(response.status_code):
+            response.body = b""
+        response.headers.raw.extend(
+            (name, value) for name, value in sub_response.headers.raw if name != b"content-length"
+        )
+        return response
+
+    encode_directly.__signature__ = signature.replace(parameters=parameters, return_annotation=inspect.Signature.empty)
+    return encode_directly
+
+
+class FastJSONRoute(APIRoute):
+    """APIRoute whose dict/list results are encoded by FastJSONResponse alone, skipping jsonable_encoder."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        response_class = kwargs.get("response_class")
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        # Routes with a response model keep FastAPI's validation and serialization
+        if (isinstance(response_class, type) and issubclass(response_class, FastJSONResponse)
+                and isinstance(kwargs.get("response_model", DefaultPlaceholder(None)), DefaultPlaceholder)
+                and inspect.signature(endpoint).return_annotation is inspect.Signature.empty):
+            endpoint = _encode_directly(endpoint, response_class, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
@@ -0,0 +1,130 @@
+import contextvars
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import RPC_AUDIT_ENABLED, RPC_MEMOIZE_READS
+
+logger = logging.getLogger(__name__)
+
+# Reads whose answer cannot change within one request unless the request itself writes
+MEMOIZABLE_METHODS = frozenset({"eth_call", "eth_chainId"})
+WRITE_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+
+
+def _call_key(method: str, params) -> Tuple[str, str]:
+    return method, json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)
+
+
+class RequestAudit:
+    """JSON-RPC calls made while handling one HTTP request."""
+
+    __slots__ = ("route", "calls", "memo", "memo_hits")
+
+    def __init__(self, route: str):
+        self.route = route
+        # (method, params) -> times called
+        self.calls: Dict[Tuple[str, str], int] = {}
+        self.memo: Dict[Tuple[str, str], Any] = {}
+        self.memo_hits = 0
+
+    def record(self, method: str, params) -> Tuple[Tuple[str, str], Optional[Any]]:
+        # Returns the call key and, for a repeated memoizable read, the earlier response
+        key = _call_key(method, params)
+        self.calls[key] = self.calls.get(key, 0) + 1
+        if method in WRITE_METHODS:
+            self.memo.clear()
+            return key, None
+        cached = self.memo.get(key)
+        if cached is not None:
+            self.memo_hits += 1
+        return key, cached
+
+    def remember(self, key: Tuple[str, str], response) -> None:
+        if RPC_MEMOIZE_READS and key[0] in MEMOIZABLE_METHODS and isinstance(response, dict) and "error" not in response:
+            self.memo[key] = response
+
+    def duplicates(self) -> Dict[str, int]:
+        # method -> calls beyond the first with identical params
+        duplicates: Dict[str, int] = {}
+        for (method, _), count in self.calls.items():
+            if count > 1:
+                duplicates[method] = duplicates.get(method, 0) + count - 1
+        return duplicates
+
+
+class _RouteStats:
+    __slots__ = ("requests", "calls", "duplicates", "memo_hits", "methods")
+
+    def __init__(self):
+        self.requests = 0
+        self.calls = 0
+        self.duplicates = 0
+        self.memo_hits = 0
+        # method -> duplicate calls
+        self.methods: Dict[str, int] = {}
+
+
+_current_audit: contextvars.ContextVar[Optional[RequestAudit]] = contextvars.ContextVar("rpc_audit", default=None)
+_routes: Dict[str, _RouteStats] = {}
+_routes_lock = threading.Lock()
+
+
+def start_audit(route: str):
+    if not RPC_AUDIT_ENABLED:
+        return None, None
+    audit = RequestAudit(route)
+    return audit, _current_audit.set(audit)
+
+
+def current() -> Optional[RequestAudit]:
+    return _current_audit.get()
+
+
+def finish_audit(audit: Optional[RequestAudit], token) -> None:
+    if audit is None:
+        return
+    _current_audit.reset(token)
+    if not audit.calls:
+        return
+    duplicates = audit.duplicates()
+    with _routes_lock:
+        stats = _routes.get(audit.route)
+        if stats is None:
+            stats = _routes[audit.route] = _RouteStats()
+        stats.requests += 1
+        stats.calls += sum(audit.calls.values())
+        stats.memo_hits += audit.memo_hits
+        new_methods = [method for method in duplicates if method not in stats.methods]
+        for method, count in duplicates.items():
+            stats.duplicates += count
+            stats.methods[method] = stats.methods.get(method, 0) + count
+    # Flag each offending route/method once; the running totals are in report()
+    if new_methods:
+        logger.info(f"Duplicate JSON-RPC calls in {audit.route}: "
+                    f"{', '.join(f'{method} x{duplicates[method] + 1}' for method in new_methods)}")
+
+
+def report(top: int = 20) -> List[Dict]:
+    # Routes with the most repeated calls first
+    with _routes_lock:
+        rows = [
+            {
+                "route": route,
+                "requests": stats.requests,
+                "calls": stats.calls,
+                "calls_per_request": round(stats.calls / stats.requests, 2),
+                "duplicates": stats.duplicates,
+                "memoized": stats.memo_hits,
+                "duplicate_methods": dict(sorted(stats.methods.items(), key=lambda item: -item[1])),
+            }
+            for route, stats in _routes.items()
+        ]
+    rows.sort(key=lambda row: (-row["duplicates"], -row["calls_per_request"]))
+    return rows[:top]
+
+
+def reset() -> None:
+    with _routes_lock:
+        _routes.clear()
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import secrets
+from typing import Dict, Optional
+
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class WalletSession:
+    __slots__ = ("nonce", "authenticated", "did", "did_key")
+
+    def __init__(self, nonce: str):
+        self.nonce = nonce
+        self.authenticated = False
+        self.did: Optional[str] = None
+        self.did_key: Optional[str] = None
+
+
+class SessionStore:
+    """Connect-wallet nonces and sessions, bounded by capacity (LRU) and per-entry TTL."""
+
+    def __init__(self, capacity: int, nonce_ttl: float, session_ttl: float, nonce_capacity: Optional[int] = None):
+        # Pending nonces live in their own LRU, so a flood of /connect-wallet calls
+        # cannot evict authenticated sessions
+        self._nonces = TTLCache(maxsize=nonce_capacity or capacity, ttl=nonce_ttl)
+        self._sessions = TTLCache(maxsize=capacity, ttl=session_ttl)
+
+    def connect(self, address: str) -> WalletSession:
+        # Reconnecting starts over, as it always has: the old session is dropped
+        session = WalletSession(secrets.token_hex(32))
+        self._sessions.pop(address)
+        self._nonces.set(address, session)
+        return session
+
+    def get(self, address: str) -> Optional[WalletSession]:
+        session = self._sessions.get(address)
+        return session if session is not None else self._nonces.get(address)
+
+    def mark_authenticated(self, address: str, session: WalletSession, nonce: str) -> bool:
+        # Callers await between reading the session and this call; in the meantime a reconnect may
+        # have replaced it or a concurrent login rotated its nonce, and neither must be overwritten
+        if self.get(address) is not session or session.nonce != nonce:
+            return False
+        session.authenticated = True
+        session.nonce = secrets.token_hex(32)
+        self._nonces.pop(address)
+        self._sessions.set(address, session)
+        return True
+
+    def sweep(self) -> int:
+        return self._nonces.sweep() + self._sessions.sweep()
+
+    def stats(self) -> Dict[str, int]:
+        nonces = self._nonces.stats()
+        sessions = self._sessions.stats()
+        return {
+            "live_sessions": sessions["size"],
+            "pending_nonces": nonces["size"],
+            "capacity": sessions["maxsize"],
+            "nonce_capacity": nonces["maxsize"],
+            "evictions": nonces["evictions"] + sessions["evictions"],
+            "expirations": nonces["expirations"] + sessions["expirations"],
+        }
+
+    def nonce_cache_stats(self) -> Dict[str, int]:
+        return self._nonces.stats()
+
+    def session_cache_stats(self) -> Dict[str, int]:
+        return self._sessions.stats()
+
+    async def run_sweeper(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            expired = self.sweep()
+            if expired:
+                logger.debug(f"Swept {expired} expired wallet sessions")
+
+    def __contains__(self, address: str) -> bool:
+        return self.get(address) is not None
+
+    def __len__(self) -> int:
+        return len(self._nonces) + len(self._sessions)
@@ -0,0 +1,62 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from typing import Any, Dict, List, Optional
+
+from config import SESSION_SECRETS, SESSION_TOKEN_TTL
+
+logger = logging.getLogger(__name__)
+
+
+def _load_secrets() -> List[bytes]:
+    # The first secret signs new tokens; the rest are still accepted, which allows rotation
+    keys = [secret.strip().encode() for secret in SESSION_SECRETS.split(',') if secret.strip()]
+    if not keys:
+        logger.warning("SESSION_SECRET is not set; using a random per-process secret. "
+                       "Session tokens will not be valid across workers or restarts.")
+        keys = [secrets.token_bytes(32)]
+    return keys
+
+_secrets = _load_secrets()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def _sign(secret: bytes, payload: str) -> str:
+    return _b64encode(hmac.new(secret, payload.encode(), hashlib.sha256).digest())
+
+
+def issue_session_token(wallet_address: str, did: Optional[str] = None, ttl: int = SESSION_TOKEN_TTL) -> str:
+    now = int(time.time())
+    claims = {"sub": wallet_address, "iat": now, "exp": now + ttl}
+    if did:
+        claims["did"] = did
+    payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode())
+    return f"{payload}.{_sign(_secrets[0], payload)}"
+
+
+def verify_session_token(token: str) -> Optional[Dict[str, Any]]:
+    try:
+        payload, signature = token.split('.')
+    except ValueError:
+        return None
+    # compare_digest only accepts ASCII str, so compare bytes; tokens come straight from clients
+    if not any(hmac.compare_digest(signature.encode(), _sign(secret, payload).encode()) for secret in _secrets):
+        return None
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if not isinstance(claims, dict) or claims.get("exp", 0) <= time.time() or "sub" not in claims:
+        return None
+    return claims
@@ -0,0 +1,97 @@
+import contextvars
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from config import SERVER_TIMING_ENABLED, TRACE_SAMPLE_RATE, TRACE_SLOW_MS
+
+logger = logging.getLogger(__name__)
+
+
+class Trace:
+    """Stage timings for one request; repeated stages (e.g. receipt polling) are summed."""
+
+    __slots__ = ("method", "route", "request_id", "start", "stages")
+
+    def __init__(self, method: str, route: str, request_id: Optional[str] = None):
+        self.method = method
+        self.route = route
+        self.request_id = request_id
+        self.start = time.perf_counter()
+        # stage name -> [total seconds, count]
+        self.stages: Dict[str, List[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        entry = self.stages.get(name)
+        if entry is None:
+            self.stages[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def server_timing(self, total: float) -> str:
+        metrics = []
+        for name, (seconds, count) in self.stages.items():
+            metric = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                metric += f';desc="x{count}"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def to_json(self, status: int, total: float) -> str:
+        return json.dumps({
+            "request_id": self.request_id,
+            "method": self.method,
+            "route": self.route,
+            "status": status,
+            "duration_ms": round(total * 1000, 2),
+            "stages": {
+                name: {"ms": round(seconds * 1000, 2), "count": count}
+                for name, (seconds, count) in self.stages.items()
+            },
+        }, separators=(',', ':'))
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+
+
+def start_trace(method: str, route: str, request_id: Optional[str] = None):
+    trace = Trace(method, route, request_id)
+    return trace, _current_trace.set(trace)
+
+
+def finish_trace(trace: Trace, token, status: int) -> Optional[str]:
+    # Returns the Server-Timing header value, if enabled
+    _current_trace.reset(token)
+    total = time.perf_counter() - trace.start
+    # Slow requests are always logged, the rest are sampled
+    if total * 1000 >= TRACE_SLOW_MS or (TRACE_SAMPLE_RATE and random.random() < TRACE_SAMPLE_RATE):
+        logger.info(trace.to_json(status, total))
+    return trace.server_timing(total) if SERVER_TIMING_ENABLED else None
+
+
+def current() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def record(name: str, seconds: float) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record(name, seconds)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record(name, time.perf_counter() - start)
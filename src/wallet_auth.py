@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import List, Set, Tuple
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from config import AUTH_BATCH_SIZE, AUTH_BATCH_DELAY_MS
+from .executor import executor_workers, run_in_executor
+
+logger = logging.getLogger(__name__)
+
+# One shared Account instance instead of a new Web3() per login
+_account = Account()
+
+
+def auth_message(nonce: str) -> str:
+    return f"Authenticate to Data Marketplace with nonce: {nonce}"
+
+
+def _verify_batch(items: List[Tuple[str, str, str]]) -> List[bool]:
+    results = []
+    for address, message, signature in items:
+        try:
+            recovered_address = _account.recover_message(encode_defunct(text=message), signature=signature)
+            results.append(recovered_address.lower() == address.lower())
+        except Exception as e:
+            logger.debug(f"Signature recovery failed for {address}: {str(e)}")
+            results.append(False)
+    return results
+
+
+async def verify_signatures(items: List[Tuple[str, str, str]]) -> List[bool]:
+    # (address, message, signature) triples, recovered in a single executor hop
+    if not items:
+        return []
+    return await run_in_executor(_verify_batch, list(items))
+
+
+class WalletAuthVerifier:
+    """Coalesces concurrent signature checks into executor batches during login storms."""
+
+    def __init__(self, max_batch_size: int = AUTH_BATCH_SIZE, max_delay: float = AUTH_BATCH_DELAY_MS / 1000):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: List[Tuple[Tuple[str, str, str], asyncio.Future]] = []
+        self._flush_handle = None
+        # The event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def verify(self, address: str, message: str, signature: str) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((address, message, signature), future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    async def verify_many(self, items: List[Tuple[str, str, str]]) -> List[bool]:
+        chunks = [items[i:i + self.max_batch_size] for i in range(0, len(items), self.max_batch_size)]
+        results = await asyncio.gather(*(verify_signatures(chunk) for chunk in chunks))
+        return [result for chunk in results for result in chunk]
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        # One executor hop per worker. Under the thread executor the chunks contend for the GIL,
+        # so only CRYPTO_EXECUTOR=process recovers them in parallel; threads still keep the
+        # work off the event loop
+        size = -(-len(batch) // executor_workers())
+        for i in range(0, len(batch), size):
+            task = asyncio.ensure_future(self._run_batch(batch[i:i + size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch) -> None:
+        try:
+            results = await verify_signatures([item for item, _ in batch])
+        except Exception as e:
+            logger.error(f"Signature batch of {len(batch)} failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+auth_verifier = WalletAuthVerifier()
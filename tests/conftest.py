@@ -0,0 +1,10 @@
+"""The key store, legacy key file and asset catalog are pointed at a throwaway directory before
+anything from src is imported, so test runs never touch, or inherit, keys.db or catalog.db
+in the checkout."""
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="core-tests-")
+os.environ["KEY_STORE_PATH"] = os.path.join(_tmp, "keys.db")
+os.environ["KEY_FILE"] = os.path.join(_tmp, "keys.json")
+os.environ["CATALOG_DB_PATH"] = os.path.join(_tmp, "catalog.db")
@@ -0,0 +1,37 @@
+import pytest
+from src.assets import AssetRecord
+
+def make_record(**overrides):
+    fields = dict(asset_id=7, owner="0xabc", name="Weather", description="Hourly readings",
+                  price=10**30, is_stream=False, ipfs_hash="Qm...")
+    fields.update(overrides)
+    return AssetRecord(**fields)
+
+def test_records_use_slots():
+    with pytest.raises(AttributeError):
+        make_record().extra = True
+
+def test_mapping_access_matches_legacy_dicts():
+    record = make_record()
+    assert record["owner"] == "0xabc"
+    assert record.get("stream_id") is None
+    with pytest.raises(KeyError):
+        record["stream_id"]
+    assert {"asset_id": 7, **record} == record.to_dict()
+
+def test_response_shapes():
+    record = make_record(is_stream=True, ipfs_hash=None, stream_id="s1")
+    assert record.to_dict() == {
+        "asset_id": 7, "owner": "0xabc", "name": "Weather", "description": "Hourly readings",
+        "price": 10**30, "is_stream": True, "stream_id": "s1"
+    }
+    assert record.to_listing() == {
+        "id": 7, "name": "Weather", "description": "Hourly readings",
+        "price": 10**30, "owner": "0xabc", "is_stream": True
+    }
+
+def test_from_row_decodes_stored_values():
+    row = (7, "0xabc", "Weather", "Hourly readings", str(10**30).zfill(78), 1, None, "s1")
+    record = AssetRecord.from_row(row)
+    assert record.price == 10**30 and record.is_stream is True
+    assert record == make_record(is_stream=True, ipfs_hash=None, stream_id="s1")
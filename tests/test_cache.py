@@ -0,0 +1,34 @@
+from unittest.mock import patch
+from src.cache import TTLCache
+
+def test_get_and_set():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+def test_expiry():
+    cache = TTLCache(maxsize=10, ttl=5)
+    with patch("src.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=50)
+    with patch("src.cache.time.monotonic", return_value=110.0):
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        cache.set("c", 3, ttl=1)
+    with patch("src.cache.time.monotonic", return_value=200.0):
+        assert cache.sweep() == 2
+    assert len(cache) == 0
@@ -0,0 +1,171 @@
+import pytest
+from src.catalog import AssetCatalog
+
+@pytest.fixture
+def catalog(tmp_path):
+    return AssetCatalog(str(tmp_path / "catalog.db"))
+
+def make_asset(owner, price=100, is_stream=False):
+    return {
+        "owner": owner,
+        "name": "Test Asset",
+        "description": "A test asset",
+        "price": price,
+        "is_stream": is_stream,
+        "ipfs_hash": "Qm..."
+    }
+
+def test_add_get_delete(catalog):
+    catalog.add(1, make_asset("0xabc"), tx_hash="0x01")
+    assert 1 in catalog
+    assert catalog[1]["owner"] == "0xabc"
+    assert catalog.get(2) is None
+
+    catalog.delete(1)
+    assert 1 not in catalog
+    with pytest.raises(KeyError):
+        catalog[1]
+
+def test_transfer_and_list_by_owner(catalog):
+    catalog.add(1, make_asset("0xabc"))
+    catalog.add(2, make_asset("0xabc"))
+    catalog.add(3, make_asset("0xdef"))
+    catalog.transfer(2, "0xdef", tx_hash="0x02")
+
+    assert [asset_id for asset_id, _ in catalog.list_by_owner("0xabc")] == [1]
+    assert [asset_id for asset_id, _ in catalog.list_by_owner("0xdef")] == [2, 3]
+    assert catalog[2]["owner"] == "0xdef"
+
+def test_large_prices_round_trip(catalog):
+    price = 10**30
+    catalog.add(1, make_asset("0xabc", price=price))
+    assert catalog[1]["price"] == price
+
+def test_survives_restart_and_sees_other_workers(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    first = AssetCatalog(path)
+    second = AssetCatalog(path)
+    first.add(1, make_asset("0xabc"))
+    assert second[1]["owner"] == "0xabc"
+
+    first.transfer(1, "0xdef")
+    assert second[1]["owner"] == "0xdef"
+    assert AssetCatalog(path)[1]["owner"] == "0xdef"
+
+def test_failed_transaction_rolls_back(catalog):
+    with pytest.raises(RuntimeError):
+        with catalog.transaction() as tx:
+            tx.add(1, make_asset("0xabc"))
+            raise RuntimeError("chain confirmation failed")
+    assert 1 not in catalog
+
+def test_owner_index_is_maintained(catalog):
+    catalog.add(1, make_asset("0xabc"))
+    assert [asset_id for asset_id, _ in catalog.list_by_owner("0xabc")] == [1]
+    assert catalog.list_by_owner("0xdef") == []
+
+    catalog.add(2, make_asset("0xabc"))
+    catalog.transfer(1, "0xdef")
+    catalog.delete(2)
+    catalog.transfer(99, "0xdef")
+    assert catalog.list_by_owner("0xabc") == []
+    assert [asset_id for asset_id, _ in catalog.list_by_owner("0xdef")] == [1]
+    assert catalog._owner_index == {"0xabc": set(), "0xdef": {1}}
+
+def test_owner_index_ignores_rolled_back_writes(catalog):
+    catalog.add(1, make_asset("0xabc"))
+    catalog.list_by_owner("0xabc")
+    with pytest.raises(RuntimeError):
+        with catalog.transaction() as tx:
+            tx.transfer(1, "0xdef")
+            raise RuntimeError("chain confirmation failed")
+    assert [asset_id for asset_id, _ in catalog.list_by_owner("0xabc")] == [1]
+
+def test_page_through_catalog(catalog):
+    for asset_id in range(1, 11):
+        catalog.add(asset_id, make_asset("0xabc" if asset_id % 2 else "0xdef", price=asset_id % 4, is_stream=asset_id > 5))
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = catalog.page(3, cursor=cursor)
+        seen.extend(asset_id for asset_id, _ in page)
+        if cursor is None:
+            break
+    assert seen == list(range(1, 11))
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = catalog.page(4, cursor=cursor, sort="price_desc")
+        seen.extend((asset["price"], asset_id) for asset_id, asset in page)
+        if cursor is None:
+            break
+    assert seen == sorted(((asset_id % 4, asset_id) for asset_id in range(1, 11)), reverse=True)
+
+def test_page_filters(catalog):
+    for asset_id in range(1, 11):
+        catalog.add(asset_id, make_asset("0xabc" if asset_id % 2 else "0xdef", price=asset_id * 10, is_stream=asset_id > 5))
+
+    page, cursor = catalog.page(10, min_price=30, max_price=80, is_stream=True, owner="0xabc")
+    assert [asset_id for asset_id, _ in page] == [7]
+    assert cursor is None
+
+def test_page_rejects_foreign_cursor(catalog):
+    for asset_id in range(1, 4):
+        catalog.add(asset_id, make_asset("0xabc"))
+    _, cursor = catalog.page(1)
+    with pytest.raises(ValueError):
+        catalog.page(1, cursor=cursor, sort="price_asc")
+    with pytest.raises(ValueError):
+        catalog.page(1, cursor="garbage")
+
+def test_search_tracks_catalog_changes(catalog):
+    catalog.add(1, {**make_asset("0xabc"), "name": "Weather stations", "description": "Hourly readings"})
+    catalog.add(2, {**make_asset("0xabc"), "name": "Traffic counts", "description": "Weather adjusted traffic"})
+    catalog.add(3, {**make_asset("0xabc"), "name": "Stock ticks", "description": "Market data"})
+
+    hits, cursor, truncated = catalog.search("weath", 10)
+    assert [asset_id for asset_id, _ in hits] == [1, 2]
+    assert cursor is None
+    assert not truncated
+
+    catalog.delete(1)
+    catalog.add(3, {**make_asset("0xabc"), "name": "Weather ticks", "description": "Market data"})
+    assert [asset_id for asset_id, _ in catalog.search("weather", 10)[0]] == [3, 2]
+    assert catalog.search("stock", 10)[0] == []
+
+def test_search_pagination(catalog):
+    for asset_id in range(1, 6):
+        catalog.add(asset_id, {**make_asset("0xabc"), "name": f"Sensor feed {asset_id}"})
+    first, cursor, _ = catalog.search("sensor", 3)
+    second, cursor2, _ = catalog.search("sensor", 3, cursor=cursor)
+    assert len(first) == 3 and len(second) == 2 and cursor2 is None
+    assert {asset_id for asset_id, _ in first + second} == set(range(1, 6))
+    assert catalog.search("!!!", 3) == ([], None, False)
+
+def test_search_reports_truncated_ranking(catalog, monkeypatch):
+    monkeypatch.setattr("src.catalog.SEARCH_MAX_CANDIDATES", 3)
+    for asset_id in range(1, 6):
+        catalog.add(asset_id, {**make_asset("0xabc"), "name": f"Sensor feed {asset_id}"})
+    hits, cursor, truncated = catalog.search("sensor", 10)
+    assert truncated
+    assert sorted(asset_id for asset_id, _ in hits) == [3, 4, 5]
+    assert cursor is None
+    assert catalog.search("sensor 5", 10)[2] is False
+
+def test_version_moves_on_committed_writes(catalog):
+    version = catalog.version
+    catalog.add(1, make_asset("0xabc"))
+    assert catalog.version == version + 1
+    catalog.get(1)
+    catalog.page(10)
+    assert catalog.version == version + 1
+    catalog.transfer(1, "0xdef")
+    catalog.delete(1)
+    assert catalog.version == version + 3
+
+def test_version_moves_on_writes_from_another_worker(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    reader, writer = AssetCatalog(path), AssetCatalog(path)
+    version = reader.version
+    writer.add(1, make_asset("0xabc"))
+    assert reader.version != version
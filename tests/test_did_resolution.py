@@ -0,0 +1,68 @@
+import asyncio
+import json
+import didkit
+import pytest
+from fastapi import HTTPException
+from unittest.mock import patch
+from src import did_manager
+
+def new_did():
+    key = didkit.generate_ed25519_key()
+    return didkit.key_to_did("key", key), key
+
+def test_did_key_is_resolved_once():
+    did, _ = new_did()
+
+    async def resolve_twice():
+        first = await did_manager.resolve_did(did)
+        second = await did_manager.resolve_did(did)
+        return first, second
+
+    with patch.object(did_manager.didkit, "resolve_did", wraps=didkit.resolve_did) as resolve:
+        first, second = asyncio.run(resolve_twice())
+    resolve.assert_called_once_with(did, "{}")
+    assert first["id"] == did
+    assert second is first
+
+def test_unknown_did_is_negatively_cached():
+    did = "did:key:zzzz"
+
+    async def resolve():
+        with pytest.raises(HTTPException) as excinfo:
+            await did_manager.resolve_did(did)
+        return excinfo.value
+
+    with patch.object(did_manager.didkit, "resolve_did", wraps=didkit.resolve_did) as resolve_did:
+        assert asyncio.run(resolve()).status_code == 404
+        assert asyncio.run(resolve()).status_code == 404
+    resolve_did.assert_called_once()
+
+def test_verify_dids_on_mixed_inputs():
+    did, _ = new_did()
+    other, _ = new_did()
+    method = f"{did}#{did[len('did:key:'):]}"
+    results = asyncio.run(did_manager.verify_dids([
+        (did, method),
+        (did, f"{did}#other"),
+        (other, method),
+        ("did:key:zzzz", method),
+    ]))
+    assert results == [True, False, False, False]
+
+def test_issued_credential_verifies():
+    did, key = new_did()
+    credential = {
+        "@context": ["https://www.w3.org/2018/credentials/v1"],
+        "type": ["VerifiableCredential"],
+        "issuer": did,
+        "issuanceDate": "2024-01-01T00:00:00Z",
+        "credentialSubject": {"id": did},
+    }
+
+    async def issue_and_verify():
+        signed = await did_manager.issue_credential(did, key, credential)
+        tampered = json.loads(signed)
+        tampered["credentialSubject"]["name"] = "Mallory"
+        return await did_manager.verify_credentials([signed, json.dumps(tampered)])
+
+    assert asyncio.run(issue_and_verify()) == [True, False]
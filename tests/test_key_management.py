@@ -0,0 +1,85 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from src.key_management import KeyManager
+from src.key_store import SQLiteKeyStore
+
+def test_key_is_derived_lazily():
+    with patch.object(KeyManager, "derive_key", wraps=KeyManager("pw").derive_key) as derive:
+        manager = KeyManager("pw")
+        derive.assert_not_called()
+        manager.add_key("did:key:a", "secret")
+        assert manager.get_key("did:key:a") == "secret"
+        derive.assert_called_once()
+
+def test_handoff_file_is_reused(tmp_path):
+    handoff = str(tmp_path / "fernet.key")
+    first = KeyManager("pw", handoff_path=handoff)
+    first.add_key("did:key:a", "secret")
+    assert os.stat(handoff).st_mode & 0o777 == 0o600
+
+    second = KeyManager("pw", handoff_path=handoff)
+    with patch.object(KeyManager, "derive_key") as derive:
+        second.keys = dict(first.keys)
+        assert second.get_key("did:key:a") == "secret"
+        derive.assert_not_called()
+
+def test_concurrent_workers_derive_once(tmp_path):
+    handoff = str(tmp_path / "fernet.key")
+    managers = [KeyManager("pw", handoff_path=handoff) for _ in range(4)]
+    start = threading.Barrier(len(managers))
+
+    def load(manager):
+        start.wait()
+        return manager._load_or_derive_key()
+
+    with patch.object(KeyManager, "derive_key", autospec=True, side_effect=KeyManager.derive_key) as derive:
+        with ThreadPoolExecutor(len(managers)) as pool:
+            keys = list(pool.map(load, managers))
+    derive.assert_called_once()
+    assert len(set(keys)) == 1
+
+def test_handoff_file_from_another_password_is_ignored(tmp_path):
+    handoff = str(tmp_path / "fernet.key")
+    KeyManager("old-pw", handoff_path=handoff).add_key("did:key:a", "secret")
+
+    manager = KeyManager("new-pw", handoff_path=handoff)
+    assert manager._read_handoff() is None
+    assert manager.fernet.decrypt(manager.fernet.encrypt(b"x")) == b"x"
+    # Re-derived with the new password and handed off again
+    assert manager._read_handoff() == manager.derive_key()
+
+def test_handoff_file_without_fingerprint_is_ignored(tmp_path):
+    handoff = tmp_path / "fernet.key"
+    handoff.write_bytes(KeyManager("pw").derive_key())
+    os.chmod(handoff, 0o600)
+    assert KeyManager("pw", handoff_path=str(handoff))._read_handoff() is None
+
+def test_unsafe_handoff_file_is_ignored(tmp_path):
+    handoff = tmp_path / "fernet.key"
+    handoff.write_bytes(KeyManager("pw").derive_key())
+    os.chmod(handoff, 0o644)
+    manager = KeyManager("pw", handoff_path=str(handoff))
+    assert manager._read_handoff() is None
+
+def test_store_is_shared_between_managers(tmp_path):
+    path = str(tmp_path / "keys.db")
+    key = KeyManager("pw").derive_key().decode()
+    writer = KeyManager("pw", derived_key=key, store=SQLiteKeyStore(path))
+    reader = KeyManager("pw", derived_key=key, store=SQLiteKeyStore(path))
+
+    writer.add_key("did:key:a", "secret")
+    assert reader.get_key("did:key:a") == "secret"
+    assert reader.get_key("did:key:b") is None
+    assert len(reader.store) == 1
+
+def test_legacy_json_is_imported(tmp_path):
+    legacy = KeyManager("pw")
+    legacy.add_key("did:key:a", "secret")
+    legacy.save_to_file(str(tmp_path / "keys.json"))
+
+    manager = KeyManager("pw", derived_key=legacy.derive_key().decode(), store=SQLiteKeyStore(str(tmp_path / "keys.db")))
+    manager.load_from_file(str(tmp_path / "keys.json"))
+    assert manager.keys == {}
+    assert manager.get_key("did:key:a") == "secret"
@@ -0,0 +1,50 @@
+import json
+import logging
+import queue
+from src import tracing
+from src.logging_setup import JSONFormatter, NonBlockingQueueHandler, SamplingFilter, parse_sampling
+
+def make_record(name="src.marketplace", level=logging.INFO, msg="Transaction receipt: %s", args=("0xabc",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_formatter_includes_extra_fields():
+    entry = json.loads(JSONFormatter().format(make_record(asset_id=7)))
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "src.marketplace"
+    assert entry["msg"] == "Transaction receipt: 0xabc"
+    assert entry["asset_id"] == 7
+    assert entry["ts"].endswith("Z")
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    for _ in range(5):
+        handler.handle(make_record())
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+def test_formatting_is_deferred_only_for_immutable_args():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    receipt = {"status": 1}
+    handler.handle(make_record(args=("0xabc",)))
+    handler.handle(make_record(args=(receipt,)))
+    receipt["status"] = 0
+    deferred, formatted = handler.queue.get_nowait(), handler.queue.get_nowait()
+    assert deferred.args == ("0xabc",)
+    assert formatted.getMessage() == "Transaction receipt: {'status': 1}"
+
+def test_records_carry_the_request_id():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    trace, token = tracing.start_trace("GET", "/consumer/list-assets", "req-9")
+    handler.handle(make_record())
+    tracing.finish_trace(trace, token, 200)
+    record = handler.queue.get_nowait()
+    assert (record.request_id, record.route) == ("req-9", "/consumer/list-assets")
+
+def test_sampling_by_longest_prefix():
+    sampler = SamplingFilter(parse_sampling("src=1, src.marketplace=0"))
+    assert not sampler.filter(make_record("src.marketplace"))
+    assert sampler.filter(make_record("src.marketplace", level=logging.ERROR))
+    assert sampler.filter(make_record("src.catalog"))
+    assert sampler.filter(make_record("src.marketplacex"))
@@ -59,6 +59,20 @@ def test_authenticate_wallet(wallet):
     assert auth_response.status_code == 200
     assert auth_response.json()["status"] == "authenticated"
 
+def test_session_token_authenticates(wallet):
+    nonce = client.post("/connect-wallet", json={"address": wallet["address"]}).json()["nonce"]
+    message = f"Authenticate to Data Marketplace with nonce: {nonce}"
+    signed_message = Account.sign_message(encode_defunct(text=message), wallet["private_key"])
+    token = client.post("/authenticate-wallet", json={
+        "address": wallet["address"],
+        "signature": signed_message.signature.hex()
+    }).json()["session_token"]
+
+    response = client.get("/producer/list-assets", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    response = client.get("/producer/list-assets", headers={"Authorization": "Bearer invalid"})
+    assert response.status_code == 401
+
 @patch("main.did_manager.create_did")
 def test_create_did(mock_create_did, authenticated_wallet):
     mock_create_did.return_value = ("did:example:123", "mock_key")
@@ -218,4 +232,55 @@ def test_access_stream_asset(authenticated_wallet, mock_web3):
 
     response = client.get(f"/access-asset/{asset_id}", headers={"wallet-address": authenticated_wallet["address"]})
     assert response.status_code == 200
-    assert response.json()["stream_id"] == "stream_id_123"
\ No newline at end of file
+    assert response.json()["stream_id"] == "stream_id_123"
+
+def test_metrics_endpoint_reports_routes():
+    client.get("/health")
+    client.post("/authenticate-wallet", json={"address": "0x0", "signature": "0x0"})
+    client.post("/authenticate-wallet", json={"address": "0x0"})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'core_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert 'route="/authenticate-wallet",status="401"' in body
+    assert 'route="/authenticate-wallet",status="422"' in body
+    assert 'core_http_requests_in_flight{method="GET",route="/metrics"} 1' in body
+    assert 'core_cache_entries{cache="catalog_responses"}' in body
+    assert 'core_cache_evictions_total{cache="wallet_nonces"}' in body
+    assert 'core_cache_evictions_total{cache="wallet_sessions"}' in body
+
+def test_server_timing_header():
+    response = client.get("/health")
+    assert "total;dur=" in response.headers["server-timing"]
+    response = client.post("/authenticate-wallet", json={"address": "0x0", "signature": "0x0"})
+    assert response.status_code == 401
+    assert "total;dur=" in response.headers["server-timing"]
+
+def test_rpc_audit_report(monkeypatch):
+    assert client.get("/debug/rpc-audit").status_code == 404
+    monkeypatch.setattr("main.RPC_AUDIT_ENDPOINT", True)
+    response = client.get("/debug/rpc-audit")
+    assert response.status_code == 200
+    assert isinstance(response.json()["routes"], list)
+
+def test_ready_reports_warm_up_steps():
+    response = client.get("/ready")
+    assert response.status_code in (200, 503)
+    assert set(response.json()["checks"]) == {"keys", "chain", "contract", "catalog", "upstreams"}
+
+def test_unreachable_upstreams_do_not_block_readiness(monkeypatch):
+    import asyncio
+    import main
+    from src import instrumentation
+    monkeypatch.setattr(main, "STORE_SERVICE_URL", "http://127.0.0.1:9")
+    monkeypatch.setattr(main, "STREAM_SERVICE_URL", "")
+
+    async def warm():
+        try:
+            return await main.warm_upstreams()
+        finally:
+            await instrumentation.close_shared_session()
+
+    statuses = asyncio.run(warm())
+    assert list(statuses) == ["store"]
+    assert statuses["store"].startswith("unreachable")
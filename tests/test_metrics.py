@@ -0,0 +1,42 @@
+import pytest
+from src import instrumentation, metrics
+from src.instrumentation import InstrumentedHTTPProvider
+from src.metrics import Counter, Gauge, Histogram, Registry
+
+def test_render_exposition_format():
+    registry = Registry()
+    requests = Counter("requests_total", "Requests", ["route"], registry=registry)
+    latency = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0), registry=registry)
+    sessions = Gauge("sessions", "Sessions", registry=registry)
+    requests.labels('/a"b').inc()
+    requests.labels('/a"b').inc(2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    sessions.set_function(lambda: 7)
+
+    lines = registry.render().decode().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/a\\"b"} 3' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_count 3" in lines
+    assert "sessions 7" in lines
+
+def test_label_count_is_checked():
+    counter = Counter("checked_total", "Checked", ["method"], registry=Registry())
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+
+def test_upstream_labels_are_bounded():
+    assert instrumentation._upstream_labels(f"{instrumentation._UPSTREAMS[1][0]}/subscribe/stream-123")[1] == "/subscribe"
+    assert instrumentation._upstream_labels("http://elsewhere:9000/x/y?z=1") == ("other", "/x")
+
+def test_rpc_calls_are_counted_by_method():
+    provider = InstrumentedHTTPProvider("http://127.0.0.1:9", exception_retry_configuration=None)
+    before = metrics.RPC_ERRORS.labels("eth_blockNumber").get()
+    with pytest.raises(Exception):
+        provider.make_request("eth_blockNumber", [])
+    assert metrics.RPC_ERRORS.labels("eth_blockNumber").get() == before + 1
+    assert metrics.RPC_DURATION.labels("eth_blockNumber").counts != [0] * (len(metrics.DEFAULT_BUCKETS) + 1)
@@ -0,0 +1,61 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+import mock_services
+from mock_services import parse_bandwidth, parse_latency, sample_latency, set_profile
+
+client = TestClient(mock_services.app)
+
+@pytest.fixture(autouse=True)
+def reset_profiles():
+    yield
+    for service in mock_services.SERVICES:
+        mock_services.profiles[service] = mock_services.default_profile()
+
+def test_store_round_trips_real_bytes(tmp_path):
+    content = os.urandom(2048)
+    ipfs_hash = client.post("/store", files={"file": ("blob.bin", content)}).json()["ipfs_hash"]
+    output_path = str(tmp_path / "out.bin")
+    assert client.post("/retrieve", json={"ipfs_hash": ipfs_hash, "output_path": output_path}).json()["success"]
+    with open(output_path, "rb") as f:
+        assert f.read() == content
+    assert client.post("/delete", json={"ipfs_hash": ipfs_hash}).status_code == 200
+    assert client.post("/retrieve", json={"ipfs_hash": ipfs_hash}).status_code == 404
+
+def test_stream_fan_out():
+    stream_id = client.post("/create", json={"name": "s", "owner_address": "0xabc"}).json()["stream_id"]
+    subscribers = [
+        client.post(f"/subscribe/{stream_id}", json={"did": "did:key:z", "proof": "p"}).json()["subscription_id"]
+        for _ in range(3)
+    ]
+    assert client.post("/publish", json={"stream_id": stream_id, "data": {"t": 21.5}}).json()["delivered"] == 3
+    for subscription_id in subscribers:
+        messages = client.get(f"/poll/{subscription_id}", params={"timeout": 0}).json()["messages"]
+        assert [message["data"] for message in messages] == [{"t": 21.5}]
+    assert client.get(f"/poll/{subscribers[0]}", params={"timeout": 0.01}).json()["messages"] == []
+
+def test_injected_errors_and_runtime_config():
+    set_profile("store.error_rate=1")
+    assert client.post("/store", files={"file": ("a", b"x")}).status_code == 503
+    assert client.put("/sim/config", json=["store.error_rate=0", "store.error_status=500"]).status_code == 200
+    assert client.post("/store", files={"file": ("a", b"x")}).status_code == 200
+    assert client.put("/sim/config", json=["nope.latency=1"]).status_code == 400
+    assert client.get("/sim/stats").json()["services"]["store"]["errors"] >= 1
+
+def test_latency_and_bandwidth_specs():
+    assert sample_latency(parse_latency("40")) == 0.04
+    assert sample_latency(parse_latency("pareto:scale=10,alpha=1.5,max=50")) <= 0.05
+    samples = sorted(sample_latency(parse_latency("lognormal:median=40,sigma=0.5")) for _ in range(2001))
+    assert 0.03 < samples[1000] < 0.05
+    assert parse_bandwidth("20MB") == 20e6
+    assert parse_bandwidth("512KB/s") == 512e3
+    with pytest.raises(ValueError):
+        parse_latency("uniform:low=1")
+
+def test_rpc_failures_are_json_rpc_errors():
+    set_profile("rpc.error_rate=1")
+    batch = [{"jsonrpc": "2.0", "id": 1, "method": "eth_chainId", "params": []},
+             {"jsonrpc": "2.0", "id": 2, "method": "eth_gasPrice", "params": []}]
+    response = client.post("/rpc", json=batch)
+    assert response.status_code == 200
+    assert [item["error"]["code"] for item in response.json()] == [-32000, -32000]
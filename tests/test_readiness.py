@@ -0,0 +1,44 @@
+import asyncio
+from src.readiness import Readiness
+
+def test_ready_once_every_step_has_passed():
+    attempts = []
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("node not up yet")
+        return {"chain_id": 1337}
+    async def quick():
+        pass
+
+    readiness = Readiness(retry_interval=0.001)
+    readiness.add("chain", flaky)
+    readiness.add("catalog", quick)
+    assert not readiness.ready
+    assert readiness.report()["checks"]["chain"] == {"status": "pending"}
+
+    asyncio.run(readiness.run())
+    report = readiness.report()
+    assert readiness.ready
+    assert report["status"] == "ready"
+    assert len(attempts) == 3
+    assert report["checks"]["chain"]["detail"] == {"chain_id": 1337}
+    assert "detail" not in report["checks"]["catalog"]
+
+def test_failures_are_reported_while_retrying():
+    async def down():
+        raise ConnectionError("connection refused")
+
+    async def probe():
+        readiness = Readiness(retry_interval=0.001)
+        readiness.add("upstreams", down)
+        task = asyncio.create_task(readiness.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        return readiness.report()
+
+    report = asyncio.run(probe())
+    assert report["status"] == "warming"
+    assert report["checks"]["upstreams"]["status"] == "failed"
+    assert report["checks"]["upstreams"]["attempts"] >= 2
+    assert report["checks"]["upstreams"]["error"] == "connection refused"
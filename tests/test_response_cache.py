@@ -0,0 +1,27 @@
+import json
+from src.response_cache import ResponseCache
+
+def test_serves_cached_bytes_until_version_changes():
+    cache = ResponseCache(maxsize=10)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"success": True, "assets": [{"id": 1, "price": 10**30}]}
+
+    first = cache.respond(("list",), 1, build)
+    second = cache.respond(("list",), 1, build)
+    assert len(calls) == 1
+    assert first.body == second.body
+    assert first.media_type == "application/json"
+    assert json.loads(second.body)["assets"][0]["price"] == str(10**30)
+
+    cache.respond(("list",), 2, build)
+    assert len(calls) == 2
+
+def test_keys_are_independent():
+    cache = ResponseCache(maxsize=10)
+    cache.set(("a", 1), 1, b"{}")
+    assert cache.get(("a", 1), 1) == b"{}"
+    assert cache.get(("a", 2), 1) is None
+    assert cache.get(("a", 1), 2) is None
@@ -0,0 +1,64 @@
+import json
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from src import responses
+from src.responses import FastJSONResponse, FastJSONRoute
+
+RECEIPT = AttributeDict({
+    "transactionHash": HexBytes("0x" + "ab" * 32),
+    "blockNumber": 12,
+    "status": 1,
+    "logs": [AttributeDict({"data": HexBytes("0x01"), "topics": (HexBytes("0x" + "cd" * 32),)})],
+})
+
+def test_encodes_web3_types():
+    body = json.loads(FastJSONResponse(RECEIPT).body)
+    assert body["transactionHash"] == "0x" + "ab" * 32
+    assert body["logs"][0]["topics"] == ["0x" + "cd" * 32]
+
+def test_large_ints_become_strings():
+    body = json.loads(FastJSONResponse({"price": 10**30, "gas": 2**64 - 1, "assets": [{"price": -2**70}]}).body)
+    assert body == {"price": str(10**30), "gas": 2**64 - 1, "assets": [{"price": str(-2**70)}]}
+
+def test_stdlib_fallback_matches(monkeypatch):
+    content = {"receipt": RECEIPT, "price": 10**30, "name": "Météo"}
+    fast = responses.dumps(content)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert json.loads(responses.dumps(content)) == json.loads(fast)
+
+def test_unknown_types_still_fail():
+    with pytest.raises(TypeError):
+        responses.dumps({"value": object()})
+
+def test_fastapi_encoders_are_left_alone():
+    from fastapi.encoders import ENCODERS_BY_TYPE
+    assert HexBytes not in ENCODERS_BY_TYPE
+
+def test_routes_return_web3_types_directly():
+    from fastapi import FastAPI, Response
+    from fastapi.testclient import TestClient
+
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.router.route_class = FastJSONRoute
+
+    @app.get("/receipt")
+    async def receipt(big: bool = False):
+        return {"h": HexBytes("0x01ab"), "big": 2**80 if big else 1, "receipt": RECEIPT}
+
+    @app.post("/created", status_code=201)
+    def created(response: Response):
+        response.headers["X-Session-Token"] = "token"
+        return [HexBytes("0x02")]
+
+    client = TestClient(app)
+    body = client.get("/receipt", params={"big": "true"}).json()
+    assert body["h"] == "0x01ab"
+    assert body["big"] == str(2**80)
+    assert body["receipt"]["transactionHash"] == "0x" + "ab" * 32
+    assert client.get("/receipt", params={"big": "maybe"}).status_code == 422
+
+    response = client.post("/created")
+    assert response.status_code == 201
+    assert response.headers["x-session-token"] == "token"
+    assert response.json() == ["0x02"]
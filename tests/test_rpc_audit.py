@@ -0,0 +1,59 @@
+from unittest.mock import patch
+from web3 import Web3
+from src import rpc_audit
+from src.instrumentation import InstrumentedHTTPProvider
+
+CALL = [{"to": "0x" + "11" * 20, "data": "0x8da5cb5b"}, "latest"]
+
+def fake_node():
+    calls = []
+    def make_request(self, method, params):
+        calls.append(method)
+        if method == "eth_getBalance":
+            return {"jsonrpc": "2.0", "id": len(calls), "error": {"code": -32000, "message": "boom"}}
+        return {"jsonrpc": "2.0", "id": len(calls), "result": "0x" + "00" * 31 + "01"}
+    return calls, patch.object(Web3.HTTPProvider, "make_request", make_request)
+
+def test_repeated_reads_hit_the_node_once_per_request():
+    rpc_audit.reset()
+    provider = InstrumentedHTTPProvider("http://127.0.0.1:8545")
+    calls, node = fake_node()
+    with node:
+        audit, token = rpc_audit.start_audit("DELETE /producer/delete-asset/{asset_id}")
+        first = provider.make_request("eth_call", CALL)
+        assert provider.make_request("eth_call", CALL) == first
+        provider.make_request("eth_chainId", [])
+        provider.make_request("eth_chainId", [])
+        provider.make_request("eth_gasPrice", [])
+        provider.make_request("eth_gasPrice", [])
+        rpc_audit.finish_audit(audit, token)
+    assert calls == ["eth_call", "eth_chainId", "eth_gasPrice", "eth_gasPrice"]
+
+    [row] = rpc_audit.report()
+    assert row["route"] == "DELETE /producer/delete-asset/{asset_id}"
+    assert row["calls"] == 6
+    assert row["duplicates"] == 3
+    assert row["memoized"] == 2
+    assert row["duplicate_methods"] == {"eth_call": 1, "eth_chainId": 1, "eth_gasPrice": 1}
+
+def test_writes_and_errors_are_not_served_from_memo():
+    provider = InstrumentedHTTPProvider("http://127.0.0.1:8545")
+    calls, node = fake_node()
+    with node:
+        audit, token = rpc_audit.start_audit("POST /producer/add-static-asset")
+        provider.make_request("eth_call", CALL)
+        provider.make_request("eth_sendRawTransaction", ["0x00"])
+        provider.make_request("eth_call", CALL)
+        provider.make_request("eth_getBalance", ["0x0", "latest"])
+        provider.make_request("eth_getBalance", ["0x0", "latest"])
+        rpc_audit.finish_audit(audit, token)
+    assert calls == ["eth_call", "eth_sendRawTransaction", "eth_call", "eth_getBalance", "eth_getBalance"]
+
+def test_calls_outside_requests_are_not_audited():
+    provider = InstrumentedHTTPProvider("http://127.0.0.1:8545")
+    calls, node = fake_node()
+    with node:
+        provider.make_request("eth_call", CALL)
+        provider.make_request("eth_call", CALL)
+    assert calls == ["eth_call", "eth_call"]
+    assert rpc_audit.current() is None
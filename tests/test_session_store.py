@@ -0,0 +1,50 @@
+import pytest
+from src.session_store import SessionStore, WalletSession
+
+def test_connect_and_authenticate():
+    store = SessionStore(capacity=10, nonce_ttl=60, session_ttl=3600)
+    session = store.connect("0xabc")
+    nonce = session.nonce
+    assert store.get("0xabc") is session
+    assert not session.authenticated
+
+    assert store.mark_authenticated("0xabc", session, nonce)
+    assert session.authenticated
+    assert session.nonce != nonce
+    assert store.get("0xabc") is session
+
+def test_capacity_is_bounded():
+    store = SessionStore(capacity=100, nonce_ttl=60, session_ttl=3600)
+    for i in range(10000):
+        store.connect(f"0x{i:040x}")
+    assert len(store) == 100
+    assert store.stats()["evictions"] == 9900
+    assert "0x" + f"{0:040x}" not in store
+
+def test_connect_flood_does_not_evict_sessions():
+    store = SessionStore(capacity=10, nonce_ttl=60, session_ttl=3600, nonce_capacity=100)
+    session = store.connect("0xabc")
+    store.mark_authenticated("0xabc", session, session.nonce)
+    for i in range(10000):
+        store.connect(f"0x{i:040x}")
+    assert store.get("0xabc") is session
+    assert store.stats()["live_sessions"] == 1
+    assert store.stats()["pending_nonces"] == 100
+
+def test_stale_session_is_not_written_back():
+    store = SessionStore(capacity=10, nonce_ttl=60, session_ttl=3600)
+    stale = store.connect("0xabc")
+    current = store.connect("0xabc")
+    assert not store.mark_authenticated("0xabc", stale, stale.nonce)
+    assert store.get("0xabc") is current
+    assert not current.authenticated
+
+    nonce = current.nonce
+    assert store.mark_authenticated("0xabc", current, nonce)
+    # A second login that signed the same nonce lost the race
+    assert not store.mark_authenticated("0xabc", current, nonce)
+
+def test_records_use_slots():
+    session = WalletSession("nonce")
+    with pytest.raises(AttributeError):
+        session.extra = True
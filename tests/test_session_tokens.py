@@ -0,0 +1,27 @@
+from unittest.mock import patch
+from src.session_tokens import issue_session_token, verify_session_token
+
+def test_round_trip():
+    token = issue_session_token("0xabc", "did:key:mock")
+    claims = verify_session_token(token)
+    assert claims["sub"] == "0xabc"
+    assert claims["did"] == "did:key:mock"
+
+def test_tampered_token_is_rejected():
+    token = issue_session_token("0xabc")
+    payload, signature = token.split(".")
+    forged = issue_session_token("0xdef").split(".")[0]
+    assert verify_session_token(f"{forged}.{signature}") is None
+    assert verify_session_token("not-a-token") is None
+
+def test_expired_token_is_rejected():
+    token = issue_session_token("0xabc", ttl=60)
+    with patch("src.session_tokens.time.time", return_value=10**12):
+        assert verify_session_token(token) is None
+
+def test_malformed_token_is_rejected():
+    payload = issue_session_token("0xabc").split(".")[0]
+    assert verify_session_token(f"{payload}.sïgnature") is None
+    assert verify_session_token("päyload.signature") is None
+    assert verify_session_token("a.b.c") is None
+    assert verify_session_token(".") is None
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import threading
+import pytest
+from unittest.mock import patch
+from cryptography.hazmat.primitives import serialization
+from src import did_manager, executor
+
+def public_key(did):
+    return did_manager._get_signing_key(did).public_key().public_bytes(
+        serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint)
+
+def test_signing_key_is_loaded_once():
+    did, _ = did_manager._create_did()
+    with patch.object(did_manager, "get_private_key", wraps=did_manager.get_private_key) as get_private_key:
+        first = did_manager._get_signing_key(did)
+        assert did_manager._get_signing_key(did) is first
+    get_private_key.assert_called_once_with(did)
+
+def test_set_did_key_invalidates_cached_key():
+    did, _ = did_manager._create_did()
+    first = did_manager._get_signing_key(did)
+    with patch.object(did_manager, "add_private_key"):
+        did_manager.set_did_key(did, "ignored")
+    with patch.object(did_manager, "get_private_key", wraps=did_manager.get_private_key) as get_private_key:
+        assert did_manager._get_signing_key(did) is not first
+    get_private_key.assert_called_once_with(did)
+
+def test_unknown_did_cannot_sign():
+    with pytest.raises(ValueError):
+        asyncio.run(did_manager.generate_zkproofs("did:key:unknown", ["message"]))
+
+def test_thread_executor_signs_off_the_loop():
+    did, _ = asyncio.run(did_manager.create_did())
+    assert asyncio.run(executor.run_in_executor(lambda: threading.current_thread().name)).startswith("crypto")
+    proofs = asyncio.run(did_manager.generate_zkproofs(did, ["a", "b"]))
+    assert [did_manager.ZKProof.verify(proof, public_key(did)) for proof in proofs] == [True, True]
+
+def test_process_executor_signs_in_worker_processes(monkeypatch):
+    # Workers are spawned and read the key from the shared key store
+    did, _ = did_manager._create_did()
+    executor.shutdown_executor()
+    monkeypatch.setattr(executor, "CRYPTO_EXECUTOR", "process")
+    monkeypatch.setattr(executor, "CRYPTO_EXECUTOR_WORKERS", 1)
+    try:
+        assert asyncio.run(executor.run_in_executor(os.getpid)) != os.getpid()
+        proofs = asyncio.run(did_manager.generate_zkproofs(did, ["a", "b"]))
+        created, _ = asyncio.run(did_manager.create_did())
+    finally:
+        executor.shutdown_executor()
+    assert [did_manager.ZKProof.verify(proof, public_key(did)) for proof in proofs] == [True, True]
+    # Created in a worker, but written to the key store every process reads
+    assert did_manager.get_private_key(created)
@@ -0,0 +1,25 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+from src import did_manager
+
+def test_proofs_are_cached_per_did():
+    async def sign(did, message):
+        return f"{did}|{message}"
+
+    with patch.object(did_manager, "generate_zkproof", AsyncMock(side_effect=sign)) as generate:
+        first = asyncio.run(did_manager.get_subscription_proofs("did:key:a", "0xabc", ["s1", "s2"]))
+        again = asyncio.run(did_manager.get_subscription_proofs("did:key:a", "0xabc", ["s1"]))
+        rotated = asyncio.run(did_manager.get_subscription_proofs("did:key:b", "0xabc", ["s1"]))
+    assert generate.await_count == 2
+    assert again["s1"] == first["s1"] == first["s2"]
+    assert rotated["s1"].startswith("did:key:b|")
+
+def test_invalidated_proof_is_signed_again():
+    async def sign(did, message):
+        return message
+
+    with patch.object(did_manager, "generate_zkproof", AsyncMock(side_effect=sign)) as generate:
+        asyncio.run(did_manager.get_subscription_proofs("did:key:c", "0xdef", ["s1"]))
+        did_manager.invalidate_subscription_proofs("did:key:c", "0xdef", ["s1"])
+        asyncio.run(did_manager.get_subscription_proofs("did:key:c", "0xdef", ["s1"]))
+    assert generate.await_count == 2
@@ -0,0 +1,34 @@
+import json
+import logging
+import time
+from src import tracing
+from src.tracing import stage
+
+def test_stages_are_summed_into_server_timing():
+    trace, token = tracing.start_trace("POST", "/consumer/purchase-asset/{asset_id}")
+    with stage("zkproof"):
+        time.sleep(0.01)
+    tracing.record("rpc.eth_getTransactionReceipt", 0.002)
+    tracing.record("rpc.eth_getTransactionReceipt", 0.003)
+    header = tracing.finish_trace(trace, token, 200)
+
+    metrics = dict(part.split(";", 1) for part in header.split(", "))
+    assert float(metrics["zkproof"].split("=")[1]) >= 10
+    assert metrics["rpc.eth_getTransactionReceipt"] == 'dur=5.0;desc="x2"'
+    assert "total" in metrics
+
+def test_no_trace_outside_requests():
+    with stage("zkproof"):
+        pass
+    tracing.record("rpc.eth_call", 0.1)
+
+def test_slow_requests_are_logged(monkeypatch, caplog):
+    monkeypatch.setattr(tracing, "TRACE_SLOW_MS", 0)
+    trace, token = tracing.start_trace("GET", "/health", "req-1")
+    tracing.record("catalog_write", 0.001)
+    with caplog.at_level(logging.INFO, logger="src.tracing"):
+        tracing.finish_trace(trace, token, 200)
+    entry = json.loads(caplog.records[-1].getMessage())
+    assert entry["request_id"] == "req-1"
+    assert entry["route"] == "/health"
+    assert entry["stages"]["catalog_write"]["count"] == 1
@@ -0,0 +1,52 @@
+import asyncio
+from unittest.mock import patch
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from src import wallet_auth
+from src.wallet_auth import WalletAuthVerifier, auth_message
+
+def signed(nonce):
+    account = Account.create()
+    message = auth_message(nonce)
+    signature = Account.sign_message(encode_defunct(text=message), account.key).signature.hex()
+    return account.address, message, signature
+
+def test_concurrent_logins_are_batched():
+    items = [signed(str(i)) for i in range(6)]
+    # A valid signature presented for another wallet
+    items.append((items[1][0], items[0][1], items[0][2]))
+    items.append((items[2][0], items[2][1], "0x1234"))
+
+    async def login_storm():
+        verifier = WalletAuthVerifier(max_batch_size=100, max_delay=0.01)
+        return await asyncio.gather(*(verifier.verify(*item) for item in items))
+
+    with patch.object(wallet_auth, "executor_workers", return_value=3), \
+            patch.object(wallet_auth, "verify_signatures", wraps=wallet_auth.verify_signatures) as verify:
+        results = asyncio.run(login_storm())
+    assert results == [True] * 6 + [False, False]
+    assert [len(call.args[0]) for call in verify.call_args_list] == [3, 3, 2]
+
+def test_full_batch_is_flushed_without_waiting():
+    items = [signed(str(i)) for i in range(4)]
+
+    async def login_storm():
+        verifier = WalletAuthVerifier(max_batch_size=2, max_delay=60)
+        return await asyncio.wait_for(asyncio.gather(*(verifier.verify(*item) for item in items)), timeout=5)
+
+    with patch.object(wallet_auth, "executor_workers", return_value=1):
+        assert asyncio.run(login_storm()) == [True] * 4
+
+def test_batch_errors_reach_every_caller():
+    async def broken(items):
+        raise RuntimeError("executor is shut down")
+
+    async def login_storm():
+        verifier = WalletAuthVerifier(max_batch_size=10, max_delay=0.001)
+        results = await asyncio.gather(*(verifier.verify(*signed(str(i))) for i in range(3)), return_exceptions=True)
+        return results, verifier._tasks
+
+    with patch.object(wallet_auth, "verify_signatures", broken):
+        results, tasks = asyncio.run(login_storm())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not tasks